@@ -0,0 +1,204 @@
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+import traceback
+
+import torch
+
+from ServiceSim import CustomerServiceBot, MultiTaskClassifier, QUESTION_LABELS
+
+def read_texts(path):
+    """
+    Reads one utterance per line, skipping blank lines.
+
+    Args:
+        path (str): The text file.
+
+    Returns:
+        list: The utterances.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def read_labeled_texts(path):
+    """
+    Reads an evaluation file of tab-separated lines: text, optional sentiment label, optional question label.
+
+    Sentiment labels are "Positive"/"Negative" (or 1/0); question labels are names from QUESTION_LABELS.
+    Missing labels are stored as None, so unlabeled text files can be used to measure teacher agreement only.
+
+    Args:
+        path (str): The evaluation file.
+
+    Returns:
+        tuple: The texts, sentiment labels and question labels as three lists.
+    """
+    texts, sentiments, questions = [], [], []
+    for line in read_texts(path):
+        fields = [field.strip() for field in line.split("\t")] + [None, None]
+        sentiment = fields[1] or None
+        if sentiment in ("1", "0"):
+            sentiment = "Positive" if sentiment == "1" else "Negative"
+        texts.append(fields[0])
+        sentiments.append(sentiment)
+        questions.append(fields[2] or None)
+    return texts, sentiments, questions
+
+def distill(teacher, texts, epochs=3, batch_size=16, learning_rate=2e-5, seed=0):
+    """
+    Distills the separate sentiment and question classifiers into a shared-encoder MultiTaskClassifier.
+
+    The student starts from the sentiment encoder with both original heads and is trained to match the
+    teachers' class probabilities (KL divergence) on the given utterances, so no labels are required.
+
+    Args:
+        teacher (CustomerServiceBot): A bot using the separate classifiers.
+        texts (list): The unlabeled training utterances.
+        epochs (int): The number of passes over the training data.
+        batch_size (int): The number of utterances per optimization step.
+        learning_rate (float): The AdamW learning rate.
+        seed (int): Seed for shuffling.
+
+    Returns:
+        MultiTaskClassifier: The distilled student, in evaluation mode on the teacher's device.
+    """
+    targets = {
+        "sentiment": teacher._classify_batch(teacher.sentiment_tokenizer, teacher.sentiment_model, texts),
+        "question": teacher._classify_batch(teacher.question_tokenizer, teacher.question_model, texts),
+    }
+    student = MultiTaskClassifier.from_teachers(copy.deepcopy(teacher.sentiment_model), copy.deepcopy(teacher.question_model))
+    student.to(teacher.device).train()
+    tokenizer = teacher.sentiment_tokenizer
+    optimizer = torch.optim.AdamW(student.parameters(), lr=learning_rate)
+    rng = random.Random(seed)
+
+    for epoch in range(epochs):
+        order = list(range(len(texts)))
+        rng.shuffle(order)
+        total_loss = 0.0
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            inputs = tokenizer([texts[i] for i in batch], padding=True, truncation=True, return_tensors="pt").to(teacher.device)
+            outputs = student(**inputs)
+            loss = sum(
+                torch.nn.functional.kl_div(outputs[task].log_softmax(dim=-1), targets[task][batch].to(teacher.device), reduction="batchmean")
+                for task in outputs
+            )
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item() * len(batch)
+        print(f"Epoch {epoch + 1}/{epochs}: distillation loss {total_loss / len(texts):.4f}")
+
+    return student.eval()
+
+def evaluate(bot, texts, sentiment_labels, question_labels):
+    """
+    Classifies each utterance as a separate turn and measures accuracy and per-turn latency.
+
+    Args:
+        bot (CustomerServiceBot): The bot to evaluate.
+        texts (list): The evaluation utterances.
+        sentiment_labels (list): Gold sentiment labels, None where unknown.
+        question_labels (list): Gold question labels, None where unknown.
+
+    Returns:
+        dict: Predictions, accuracy per task (None without labels) and mean milliseconds per turn.
+    """
+    bot.classify_turn(texts[0])
+    start = time.perf_counter()
+    predictions = [bot.classify_turn(text) for text in texts]
+    elapsed = time.perf_counter() - start
+
+    def accuracy(predicted, gold):
+        pairs = [(p, g) for p, g in zip(predicted, gold) if g is not None]
+        return sum(p == g for p, g in pairs) / len(pairs) if pairs else None
+
+    return {
+        "sentiment": [sentiment for sentiment, _, _ in predictions],
+        "question": [question for _, _, question in predictions],
+        "sentiment_accuracy": accuracy([sentiment for sentiment, _, _ in predictions], sentiment_labels),
+        "question_accuracy": accuracy([question for _, _, question in predictions], question_labels),
+        "ms_per_turn": 1000 * elapsed / len(texts),
+    }
+
+def compare(teacher_results, student_results):
+    """
+    Summarizes the separate models against the multi-task model.
+
+    Args:
+        teacher_results (dict): The evaluation of the separate classifiers.
+        student_results (dict): The evaluation of the multi-task classifier.
+
+    Returns:
+        dict: Accuracy, teacher agreement and latency of both setups.
+    """
+    def agreement(task):
+        return sum(t == s for t, s in zip(teacher_results[task], student_results[task])) / len(teacher_results[task])
+
+    return {
+        "separate": {key: teacher_results[key] for key in ("sentiment_accuracy", "question_accuracy", "ms_per_turn")},
+        "multitask": {key: student_results[key] for key in ("sentiment_accuracy", "question_accuracy", "ms_per_turn")},
+        "sentiment_agreement": agreement("sentiment"),
+        "question_agreement": agreement("question"),
+        "speedup": teacher_results["ms_per_turn"] / student_results["ms_per_turn"],
+    }
+
+def print_comparison(comparison):
+    """Prints the accuracy and latency comparison as a table."""
+    def fmt(value):
+        return "n/a" if value is None else f"{value:.3f}"
+
+    print(f"\n{'Setup':<12}{'Sentiment acc':>15}{'Question acc':>15}{'ms/turn':>10}")
+    for setup in ("separate", "multitask"):
+        row = comparison[setup]
+        print(f"{setup:<12}{fmt(row['sentiment_accuracy']):>15}{fmt(row['question_accuracy']):>15}{row['ms_per_turn']:>10.2f}")
+    print(f"\nAgreement with separate models: sentiment {comparison['sentiment_agreement']:.3f}, "
+          f"question {comparison['question_agreement']:.3f}")
+    print(f"Per-turn classification speedup: {comparison['speedup']:.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the sentiment and question classifiers into one shared-encoder model.")
+    parser.add_argument("--train-file", required=True, help="Unlabeled customer utterances, one per line.")
+    parser.add_argument("--eval-file", required=True, help="Held-out utterances, optionally tab-separated with sentiment and question labels.")
+    parser.add_argument("--output-dir", default="multitask_model", help="Where to save the distilled model.")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--learning-rate", type=float, default=2e-5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", default=None, help="Optional JSON file for the comparison.")
+    args = parser.parse_args()
+
+    try:
+        torch.manual_seed(args.seed)
+        teacher = CustomerServiceBot(summary_cache_path=None)
+        student = distill(teacher, read_texts(args.train_file), args.epochs, args.batch_size, args.learning_rate, args.seed)
+        student.save_pretrained(args.output_dir)
+        teacher.sentiment_tokenizer.save_pretrained(args.output_dir)
+        print(f"Saved multi-task model to {args.output_dir}")
+
+        texts, sentiment_labels, question_labels = read_labeled_texts(args.eval_file)
+        unknown = {label for label in question_labels if label is not None} - set(QUESTION_LABELS.values())
+        if unknown:
+            raise ValueError(f"Unknown question labels in {args.eval_file}: {sorted(unknown)}")
+
+        multitask_bot = CustomerServiceBot(summary_cache_path=None, multitask_model_path=args.output_dir)
+        comparison = compare(
+            evaluate(teacher, texts, sentiment_labels, question_labels),
+            evaluate(multitask_bot, texts, sentiment_labels, question_labels),
+        )
+        print_comparison(comparison)
+
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(comparison, f, indent=2)
+    except Exception as e:
+        print(f"Distillation failed: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
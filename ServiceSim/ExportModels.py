@@ -0,0 +1,187 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import traceback
+
+import torch
+
+from ServiceSim import CustomerServiceBot, DEFAULT_ONNX_MODEL_DIR
+
+SAMPLE_UTTERANCES = [
+    "Hi, I just wanted to check on my order status. Everything has been great so far!",
+    "Hi, I haven't received my order yet and I'm getting frustrated.",
+    "Sure, the order number is 4821.",
+    "I ordered the GizmoTron.",
+    "I ordered the Thingamajig.",
+    "When will my order be shipped?",
+    "Who is handling the delivery to Boston?",
+    "How many days does international shipping take?",
+    "This is the third time I am asking, please cancel my order.",
+    "Thank you!",
+]
+
+def export_models(bot, output_dir, quantize=True):
+    """
+    Exports the sentiment, question, NER and summarization models to ONNX with optimum.
+
+    The BART summarizer is exported as separate encoder and decoder graphs (with and without
+    past key values) so generation can reuse the decoder cache. Each model is written to its
+    own subdirectory, which is where CustomerServiceBot's "onnx" backend looks for it.
+
+    Args:
+        bot (CustomerServiceBot): A bot providing the model names to export.
+        output_dir (str): The directory to write the graphs to.
+        quantize (bool): If True, replaces every graph by its dynamically int8-quantized version.
+
+    Returns:
+        dict: The export directory per component.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTModelForTokenClassification, ORTModelForSeq2SeqLM
+
+    exports = {
+        "sentiment": (ORTModelForSequenceClassification, bot.sentiment_model_name),
+        "question": (ORTModelForSequenceClassification, bot.question_model_name),
+        "ner": (ORTModelForTokenClassification, bot.ner_model_name),
+        "summarizer": (ORTModelForSeq2SeqLM, bot.summarizer_model_name),
+    }
+    paths = {}
+    for component, (onnx_class, model_name) in exports.items():
+        path = os.path.join(output_dir, component)
+        print(f"Exporting {model_name} to {path}...")
+        onnx_class.from_pretrained(model_name, export=True).save_pretrained(path)
+        if quantize:
+            quantize_graphs(path)
+        paths[component] = path
+    return paths
+
+def quantize_graphs(path):
+    """
+    Dynamically quantizes the weights of every ONNX graph in a directory to int8, in place.
+
+    Args:
+        path (str): The directory containing the .onnx files.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    for graph in glob.glob(os.path.join(path, "*.onnx")):
+        quantized = f"{graph}.int8"
+        quantize_dynamic(graph, quantized, weight_type=QuantType.QInt8)
+        os.replace(quantized, graph)
+        print(f"Quantized {graph} to int8.")
+
+def _time_per_item(function, items):
+    """Returns the results of function applied to each item separately and the mean milliseconds per item."""
+    function(items[0])
+    start = time.perf_counter()
+    results = [function(item) for item in items]
+    return results, 1000 * (time.perf_counter() - start) / len(items)
+
+def parity_check(reference, candidate, utterances=SAMPLE_UTTERANCES, tolerance=0.05, min_agreement=0.9):
+    """
+    Compares a candidate inference backend against the reference on sample utterances.
+
+    Every turn is processed on its own, as in a live conversation, so the latencies are per turn.
+    NER is compared on the model output itself, bypassing the product gazetteer, and the shipping
+    summaries are generated directly, bypassing the summary cache.
+
+    Args:
+        reference (CustomerServiceBot): The bot using the reference backend, normally "torch".
+        candidate (CustomerServiceBot): The bot using the backend under test.
+        utterances (list): The sample utterances.
+        tolerance (float): The largest allowed difference in sentiment probability.
+        min_agreement (float): The smallest allowed fraction of identical labels per task.
+
+    Returns:
+        dict: Per-task agreement, the largest sentiment probability difference, per-turn latencies,
+              the speedup and whether the candidate passed.
+    """
+    def classify(bot):
+        return lambda text: bot.classify_turn(text)
+
+    def ner(bot):
+        return lambda text: bot._stitch_entities(bot.nlp_ner(text))[1]
+
+    def summarize(bot):
+        return lambda text: bot.summarize_text(text, **bot.shipping_summary_params)
+
+    def agreement(first, second):
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+
+    texts = list(reference.shipping_info.values())
+    report = {"backend": candidate.inference_backend, "latency_ms": {}}
+    results = {}
+    for name, bot in (("reference", reference), ("candidate", candidate)):
+        turns, turn_ms = _time_per_item(classify(bot), utterances)
+        entities, ner_ms = _time_per_item(ner(bot), utterances)
+        summaries, summary_ms = _time_per_item(summarize(bot), texts)
+        results[name] = {"turns": turns, "entities": entities, "summaries": summaries}
+        report["latency_ms"][name] = {"classification": turn_ms, "ner": ner_ms, "summarization": summary_ms}
+
+    reference_turns, candidate_turns = results["reference"]["turns"], results["candidate"]["turns"]
+    report["sentiment_agreement"] = agreement([t[0] for t in reference_turns], [t[0] for t in candidate_turns])
+    report["max_sentiment_score_difference"] = max(abs(r[1] - c[1]) for r, c in zip(reference_turns, candidate_turns))
+    report["question_agreement"] = agreement([t[2] for t in reference_turns], [t[2] for t in candidate_turns])
+    report["ner_agreement"] = agreement(results["reference"]["entities"], results["candidate"]["entities"])
+    report["summary_agreement"] = agreement(results["reference"]["summaries"], results["candidate"]["summaries"])
+    report["speedup"] = {
+        stage: report["latency_ms"]["reference"][stage] / report["latency_ms"]["candidate"][stage]
+        for stage in report["latency_ms"]["reference"]
+    }
+    report["passed"] = (
+        report["max_sentiment_score_difference"] <= tolerance
+        and min(report["sentiment_agreement"], report["question_agreement"], report["ner_agreement"]) >= min_agreement
+    )
+    return report
+
+def print_parity_report(report):
+    """Prints a parity report as a table."""
+    print(f"\nParity of the {report['backend']} backend against torch:")
+    for key in ("sentiment_agreement", "question_agreement", "ner_agreement", "summary_agreement"):
+        print(f"  {key:<32}{report[key]:>8.2f}")
+    print(f"  {'max_sentiment_score_difference':<32}{report['max_sentiment_score_difference']:>8.4f}")
+    print(f"\n{'Stage':<16}{'torch ms':>10}{report['backend'] + ' ms':>10}{'Speedup':>10}")
+    for stage, speedup in report["speedup"].items():
+        print(f"{stage:<16}{report['latency_ms']['reference'][stage]:>10.2f}{report['latency_ms']['candidate'][stage]:>10.2f}{speedup:>9.2f}x")
+    print("\nParity check " + ("passed." if report["passed"] else "FAILED."))
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the ServiceSim models to ONNX and check backend parity.")
+    parser.add_argument("--output-dir", default=DEFAULT_ONNX_MODEL_DIR, help="Where to write the ONNX graphs.")
+    parser.add_argument("--no-quantize", action="store_true", help="Keep the exported graphs in float32.")
+    parser.add_argument("--skip-export", action="store_true", help="Only run the parity check on existing graphs.")
+    parser.add_argument("--check-parity", nargs="*", choices=["int8", "onnx"], default=None,
+                        help="Backends to compare against torch on sample utterances (default: both).")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Largest allowed sentiment probability difference.")
+    parser.add_argument("--report", default=None, help="Optional JSON file for the parity reports.")
+    args = parser.parse_args()
+
+    try:
+        torch.set_grad_enabled(False)
+        reference = CustomerServiceBot(summary_cache_path=None, headless=True, inference_backend="torch")
+        if not args.skip_export:
+            export_models(reference, args.output_dir, quantize=not args.no_quantize)
+
+        if args.check_parity is None:
+            return
+        reports = []
+        for backend in args.check_parity or ["int8", "onnx"]:
+            candidate = CustomerServiceBot(summary_cache_path=None, headless=True, inference_backend=backend, onnx_model_dir=args.output_dir)
+            report = parity_check(reference, candidate, tolerance=args.tolerance)
+            print_parity_report(report)
+            reports.append(report)
+
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(reports, f, indent=2)
+        if not all(report["passed"] for report in reports):
+            sys.exit(1)
+    except Exception as e:
+        print(f"Export failed: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
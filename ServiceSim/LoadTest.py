@@ -0,0 +1,287 @@
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from ServiceSim import CustomerServiceBot, DEFAULT_ONNX_MODEL_DIR, INFERENCE_BACKENDS
+from ServiceSimServer import MicroBatchScheduler, ServiceSimServer
+
+STAGES = ["sentiment", "classification", "ner", "summarization"]
+
+POSITIVE_OPENINGS = [
+    "Hi, I just wanted to check on my order status. Everything has been great so far!",
+    "Hello! I love shopping with you and wanted to ask about my recent order.",
+    "Good morning, your service has been excellent. Could you help me track a package?",
+]
+NEGATIVE_OPENINGS = [
+    "Hi, I haven't received my order yet and I'm getting frustrated.",
+    "This is ridiculous, my package is a week late and nobody has answered my emails.",
+    "I'm really disappointed, the tracking page hasn't updated in days.",
+]
+ORDER_TEMPLATES = [
+    "Sure, the order number is {order}.",
+    "It's order {order}.",
+    "My order number is {order}, I placed it last Tuesday.",
+]
+ITEM_TEMPLATES = [
+    "I ordered the {product}.",
+    "There should be a {product} in that order.",
+    "Just one {product}, nothing else.",
+]
+SHIPPING_QUESTIONS = [
+    "When will my order be shipped?",
+    "How long does delivery usually take?",
+    "Can you tell me how shipping works for this item?",
+]
+CLOSINGS = ["Thank you!", "Thanks, that's all I needed.", "Great, have a nice day."]
+
+def synthesize_conversations(count, products, seed=0):
+    """
+    Generates scripted conversations from templates with random order numbers, products and sentiment.
+
+    Args:
+        count (int): The number of conversations.
+        products (list): The product names to mention.
+        seed (int): Seed for the random choices.
+
+    Returns:
+        list: One dict per conversation with the customer message for each stage.
+    """
+    rng = random.Random(seed)
+    conversations = []
+    for _ in range(count):
+        product = rng.choice(products)
+        conversations.append({
+            "product": product,
+            "sentiment": rng.choice(POSITIVE_OPENINGS + NEGATIVE_OPENINGS),
+            "classification": rng.choice(ORDER_TEMPLATES).format(order=rng.randint(1000, 999999)),
+            "ner": rng.choice(ITEM_TEMPLATES).format(product=product),
+            "summarization": rng.choice(SHIPPING_QUESTIONS),
+            "closing": rng.choice(CLOSINGS),
+        })
+    return conversations
+
+class LatencyRecorder:
+    """
+    Thread-safe collection of per-stage latencies.
+
+    Attributes:
+        samples (dict): The recorded latencies in seconds per stage.
+    """
+
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        """Adds one latency sample for a stage."""
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def timed(self, stage, function, *args, **kwargs):
+        """
+        Calls a function and records its latency under the given stage.
+
+        Returns:
+            The result of the function.
+        """
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.record(stage, time.perf_counter() - start)
+        return result
+
+def percentile(values, p):
+    """
+    Computes a nearest-rank percentile.
+
+    Args:
+        values (list): The samples.
+        p (float): The percentile between 0 and 100.
+
+    Returns:
+        float: The percentile, or None for no samples.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def run_conversation_direct(bot, conversation, recorder, uncached_summaries=False):
+    """
+    Drives one conversation through the bot's methods, timing each stage.
+
+    Args:
+        bot (CustomerServiceBot): The bot under test.
+        conversation (dict): A conversation from synthesize_conversations.
+        recorder (LatencyRecorder): Collects the stage latencies.
+        uncached_summaries (bool): If True, regenerates the shipping summary with BART instead of using the cache.
+    """
+    sentiment, _ = recorder.timed("sentiment", bot.analyze_sentiment, conversation["sentiment"])
+    bot.initial_bot_response(sentiment)
+
+    recorder.timed("classification", bot.classify_question, conversation["classification"])
+    bot.order_number_response(bot.extract_order_number(conversation["classification"]))
+
+    entities = recorder.timed("ner", lambda text: bot.extract_entities_batch([text])[0], conversation["ner"])
+    bot.item_confirmation_response(entities)
+
+    product = entities[0] if entities else conversation["product"]
+    if uncached_summaries:
+        recorder.timed("summarization", bot.summarize_text, bot.shipping_info[conversation["product"]], **bot.shipping_summary_params)
+    else:
+        recorder.timed("summarization", bot.shipping_info_response, product)
+
+def run_direct(bot, conversations, concurrency=1, uncached_summaries=False):
+    """
+    Runs conversations against the bot directly, each on its own thread when concurrency > 1.
+
+    Returns:
+        tuple: The LatencyRecorder and the elapsed wall-clock seconds.
+    """
+    recorder = LatencyRecorder()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(run_conversation_direct, bot, c, recorder, uncached_summaries) for c in conversations]:
+            future.result()
+    return recorder, time.perf_counter() - start
+
+class TimedScheduler(MicroBatchScheduler):
+    """
+    A MicroBatchScheduler that records how long each model request takes, including queueing for a batch.
+
+    The scheduler's task names match the load-test stages. The server runs no model for the order-number
+    turn, so the "classification" stage only has samples in direct mode.
+
+    Attributes:
+        recorder (LatencyRecorder): Collects the request latencies under their task name.
+    """
+
+    def __init__(self, bot, recorder, max_batch_size=None, max_wait=0.01):
+        super().__init__(bot, max_batch_size, max_wait)
+        self.recorder = recorder
+
+    async def submit(self, task, item):
+        """Queues a request, waits for its result and records the latency."""
+        start = time.perf_counter()
+        result = await super().submit(task, item)
+        self.recorder.record(task, time.perf_counter() - start)
+        return result
+
+async def run_server(bot, conversations, concurrency=1, max_batch_size=None, max_wait=0.01):
+    """
+    Runs conversations through the micro-batching ServiceSimServer, at most concurrency at a time.
+
+    Each stage's latency is that of its model request, including queueing for a batch (see TimedScheduler).
+
+    Returns:
+        tuple: The LatencyRecorder and the elapsed wall-clock seconds.
+    """
+    recorder = LatencyRecorder()
+    scheduler = TimedScheduler(bot, recorder, max_batch_size, max_wait)
+    scheduler.start()
+    server = ServiceSimServer(bot, scheduler)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def converse(conversation):
+        async with limit:
+            session, _ = server.open_session()
+            for stage in STAGES + ["closing"]:
+                await server.handle_message(session.session_id, conversation[stage])
+            server.close_session(session.session_id)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(converse(conversation) for conversation in conversations))
+        elapsed = time.perf_counter() - start
+    finally:
+        await scheduler.stop()
+    return recorder, elapsed
+
+def summarize_latencies(recorder, elapsed):
+    """
+    Computes latency percentiles and throughput per stage.
+
+    Args:
+        recorder (LatencyRecorder): The recorded latencies.
+        elapsed (float): The wall-clock duration of the run in seconds.
+
+    Returns:
+        dict: Per stage, the call count, p50/p95/p99/mean latency in milliseconds and calls per second.
+    """
+    stages = {}
+    for stage, samples in recorder.samples.items():
+        if not samples:
+            continue
+        stages[stage] = {
+            "calls": len(samples),
+            "p50_ms": 1000 * percentile(samples, 50),
+            "p95_ms": 1000 * percentile(samples, 95),
+            "p99_ms": 1000 * percentile(samples, 99),
+            "mean_ms": 1000 * sum(samples) / len(samples),
+            "throughput_per_s": len(samples) / elapsed,
+        }
+    return stages
+
+def print_latency_table(report):
+    """Prints the per-stage latency report as a table."""
+    print(f"\n{'Stage':<16}{'Calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Mean ms':>10}{'Calls/s':>10}")
+    for stage, row in report["stages"].items():
+        print(f"{stage:<16}{row['calls']:>7}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+              f"{row['mean_ms']:>10.2f}{row['throughput_per_s']:>10.1f}")
+    print(f"\n{report['conversations']} conversations in {report['elapsed_time']:.2f}s "
+          f"({report['conversations_per_second']:.1f} conversations/s, mode={report['mode']}, concurrency={report['concurrency']})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test CustomerServiceBot with synthetic conversations.")
+    parser.add_argument("--conversations", type=int, default=100, help="Number of synthetic conversations.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Conversations in flight at once.")
+    parser.add_argument("--mode", choices=["direct", "server"], default="direct",
+                        help="Call the bot's methods directly or go through the micro-batching server.")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0, help="Batching deadline in server mode.")
+    parser.add_argument("--backend", choices=INFERENCE_BACKENDS, default="torch", help="Inference backend for the models.")
+    parser.add_argument("--onnx-model-dir", default=DEFAULT_ONNX_MODEL_DIR)
+    parser.add_argument("--multitask-model", default=None, help="Directory of a distilled shared-encoder classifier.")
+    parser.add_argument("--uncached-summaries", action="store_true", help="Time BART generation instead of the summary cache (direct mode).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", default=None, help="Optional JSON file for the report.")
+    args = parser.parse_args()
+
+    try:
+        bot = CustomerServiceBot(max_batch_size=args.max_batch_size, headless=True, inference_backend=args.backend,
+                                 onnx_model_dir=args.onnx_model_dir, multitask_model_path=args.multitask_model)
+        bot.warm_up(background=False)
+        conversations = synthesize_conversations(args.conversations, list(bot.shipping_info.keys()), args.seed)
+        run_conversation_direct(bot, conversations[0], LatencyRecorder(), args.uncached_summaries)
+
+        if args.mode == "direct":
+            recorder, elapsed = run_direct(bot, conversations, args.concurrency, args.uncached_summaries)
+        else:
+            recorder, elapsed = asyncio.run(run_server(bot, conversations, args.concurrency, args.max_batch_size, args.max_wait_ms / 1000))
+
+        report = {
+            "mode": args.mode,
+            "backend": args.backend,
+            "concurrency": args.concurrency,
+            "conversations": len(conversations),
+            "elapsed_time": elapsed,
+            "conversations_per_second": len(conversations) / elapsed,
+            "stages": summarize_latencies(recorder, elapsed),
+        }
+        print_latency_table(report)
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    except Exception as e:
+        print(f"Load test failed: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
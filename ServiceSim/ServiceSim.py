@@ -1,20 +1,257 @@
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 
-from transformers import AutoTokenizer, BertForSequenceClassification, AutoModelForTokenClassification, BertTokenizerFast, pipeline
-from transformers import BartForConditionalGeneration, BartTokenizer
+from transformers import AutoConfig, AutoTokenizer, BertForSequenceClassification, BertForTokenClassification, BertTokenizerFast, BertModel, pipeline
+from transformers import BartForConditionalGeneration, BartTokenizer, TextIteratorStreamer
+from transformers.modeling_outputs import BaseModelOutput
+from transformers.utils import cached_file, SAFE_WEIGHTS_NAME, WEIGHTS_NAME
+from safetensors.torch import load_file as load_safetensors
 from colorama import Fore, Back, Style, init
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTModelForTokenClassification, ORTModelForSeq2SeqLM
+except ImportError:
+    ORTModelForSequenceClassification = ORTModelForTokenClassification = ORTModelForSeq2SeqLM = None
 import time
 import random
 import re
 import pyttsx3
 import torch
 import os
+import threading
+import itertools
+import queue
+import hashlib
+import json
+import argparse
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 os.environ['TRANSFORMERS_VERBOSITY'] = 'error'
 
 init(autoreset=True)
 
+DEFAULT_SUMMARY_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shipping_summaries.json")
+DEFAULT_ONNX_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx_models")
+INFERENCE_BACKENDS = ("torch", "int8", "onnx")
+
+# transformers patches global state (torch.nn.init) while instantiating a model in from_pretrained, so
+# concurrent instantiations from warm-up threads can corrupt each other; they are serialized on this lock.
+# Resolving, downloading and reading the checkpoint happen outside it; see _from_pretrained.
+_MODEL_CONSTRUCTION_LOCK = threading.Lock()
+SHIPPING_SUMMARY_PARAMS = {"max_length": 200, "min_length": 100, "num_beams": 4, "length_penalty": 2.0}
+SUMMARY_STRATEGIES = {"beam4": {"num_beams": 4}, "beam2": {"num_beams": 2}, "greedy": {"num_beams": 1}}
+QUESTION_LABELS = {0: "Description", 1: "Entity", 2: "Expression", 3: "Human", 4: "Location", 5: "Numeric"}
+
+def _lazy_component(component, key):
+    """
+    Creates a read-only property that loads a model component on first access.
+
+    Args:
+        component (str): The name of the component loader.
+        key (str): The object of the component to return.
+
+    Returns:
+        property: The lazy property.
+    """
+    return property(lambda self: self._get_component(component)[key])
+
+class ProductGazetteer:
+    """
+    Case-insensitive multi-pattern matcher over a product catalog, built as an Aho-Corasick automaton.
+
+    Text is scanned once regardless of catalog size. Only whole-word matches count, and overlapping
+    matches are resolved leftmost-longest, so "Thingamajig Pro" wins over "Thingamajig".
+
+    Attributes:
+        products (list): The catalog product names, in their canonical spelling.
+    """
+
+    def __init__(self, products):
+        """
+        Builds the automaton.
+
+        Args:
+            products (iterable): The product names to recognize.
+        """
+        self.products = list(products)
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+
+        for product in self.products:
+            node = 0
+            for ch in product.lower():
+                if ch not in self._goto[node]:
+                    self._goto[node][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                node = self._goto[node][ch]
+            if node:
+                self._outputs[node].append((len(product.lower()), product))
+
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail][ch] if node and ch in self._goto[fail] else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                pending.append(child)
+
+    def find_all(self, text):
+        """
+        Finds the catalog products mentioned in a text.
+
+        Args:
+            text (str): The text to scan.
+
+        Returns:
+            list: The canonical names of the mentioned products, in order of first appearance.
+        """
+        lowered = text.lower()
+        matches = []
+        node = 0
+        for end, ch in enumerate(lowered):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, product in self._outputs[node]:
+                start = end - length + 1
+                if (start == 0 or not lowered[start - 1].isalnum()) and (end + 1 == len(lowered) or not lowered[end + 1].isalnum()):
+                    matches.append((start, -length, product))
+
+        products = []
+        last_end = -1
+        for start, negative_length, product in sorted(matches):
+            if start > last_end:
+                products.append(product)
+                last_end = start - negative_length - 1
+        return list(dict.fromkeys(products))
+
+def _read_checkpoint(model_name):
+    """
+    Resolves a model's config and reads its weights into memory, downloading them if needed.
+
+    Args:
+        model_name (str): The name or local path of the pre-trained model.
+
+    Returns:
+        tuple: The config and the state dict, or (None, None) if the checkpoint is sharded.
+    """
+    config = AutoConfig.from_pretrained(model_name)
+    path = cached_file(model_name, SAFE_WEIGHTS_NAME, _raise_exceptions_for_missing_entries=False)
+    if path is not None:
+        return config, load_safetensors(path)
+    path = cached_file(model_name, WEIGHTS_NAME, _raise_exceptions_for_missing_entries=False)
+    if path is not None:
+        return config, torch.load(path, map_location="cpu", weights_only=True)
+    return None, None
+
+def _from_pretrained(model_class, model_name):
+    """
+    Loads a pre-trained transformers model, holding the construction lock only while it is built from
+    weights already in memory.
+
+    Args:
+        model_class (type): The transformers class of the model.
+        model_name (str): The name or local path of the pre-trained model.
+
+    Returns:
+        The loaded model in evaluation mode.
+    """
+    config, state_dict = _read_checkpoint(model_name)
+    with _MODEL_CONSTRUCTION_LOCK:
+        if state_dict is None:
+            return model_class.from_pretrained(model_name)
+        return model_class.from_pretrained(None, config=config, state_dict=state_dict)
+
+class MultiTaskClassifier(torch.nn.Module):
+    """
+    A single BERT encoder shared by the sentiment and question classification heads.
+
+    Each head is a linear layer over the pooled [CLS] output, exactly like the classifier of a
+    BertForSequenceClassification, so one encoder pass per utterance yields both predictions.
+
+    Attributes:
+        encoder (BertModel): The shared BERT encoder, including its pooler.
+        heads (torch.nn.ModuleDict): One linear classification head per task.
+    """
+
+    def __init__(self, encoder, heads):
+        """
+        Initializes the MultiTaskClassifier.
+
+        Args:
+            encoder (BertModel): The shared BERT encoder.
+            heads (dict): Mapping of task name to its linear classification head.
+        """
+        super().__init__()
+        self.encoder = encoder
+        self.heads = torch.nn.ModuleDict(heads)
+
+    @classmethod
+    def from_teachers(cls, sentiment_model, question_model):
+        """
+        Builds a multi-task model from the separate classifiers, reusing the sentiment encoder.
+
+        The encoder and sentiment head start as the sentiment classifier's and the question head starts
+        as the question classifier's, so before distillation the sentiment predictions equal the teacher's.
+
+        Args:
+            sentiment_model (BertForSequenceClassification): The sentiment classifier.
+            question_model (BertForSequenceClassification): The question classifier.
+
+        Returns:
+            MultiTaskClassifier: The initialized multi-task model.
+        """
+        return cls(sentiment_model.bert, {
+            "sentiment": sentiment_model.classifier,
+            "question": question_model.classifier,
+        })
+
+    def forward(self, input_ids, attention_mask=None, token_type_ids=None):
+        """
+        Runs the shared encoder once and applies every head to the pooled output.
+
+        Returns:
+            dict: Mapping of task name to logits of shape (batch_size, num_labels).
+        """
+        pooled = self.encoder(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids).pooler_output
+        return {task: head(pooled) for task, head in self.heads.items()}
+
+    def save_pretrained(self, path):
+        """
+        Saves the encoder in Hugging Face format and the heads as a PyTorch state dict.
+
+        Args:
+            path (str): The output directory.
+        """
+        os.makedirs(path, exist_ok=True)
+        self.encoder.save_pretrained(path)
+        torch.save({task: head.state_dict() for task, head in self.heads.items()}, os.path.join(path, "heads.pt"))
+
+    @classmethod
+    def from_pretrained(cls, path):
+        """
+        Loads a multi-task model saved with save_pretrained.
+
+        Args:
+            path (str): The model directory.
+
+        Returns:
+            MultiTaskClassifier: The loaded model in evaluation mode.
+        """
+        encoder = _from_pretrained(BertModel, path)
+        heads = {}
+        for task, state in torch.load(os.path.join(path, "heads.pt"), map_location="cpu").items():
+            out_features, in_features = state["weight"].shape
+            heads[task] = torch.nn.Linear(in_features, out_features)
+            heads[task].load_state_dict(state)
+        return cls(encoder, heads).eval()
+
 class CustomerServiceBot:
     """
     A sophisticated customer service chatbot that utilizes various NLP models for sentiment analysis,
@@ -34,47 +271,97 @@ class CustomerServiceBot:
         question_tokenizer (AutoTokenizer): Tokenizer for the question classification model.
         question_model (BertForSequenceClassification): BERT model for question classification.
         ner_tokenizer (BertTokenizerFast): Tokenizer for the NER model.
-        ner_model (AutoModelForTokenClassification): BERT model for named entity recognition.
+        ner_model (BertForTokenClassification): BERT model for named entity recognition.
         summarizer_tokenizer (BartTokenizer): Tokenizer for the BART summarization model.
         summarizer_model (BartForConditionalGeneration): BART model for text summarization.
         nlp_ner (pipeline): Hugging Face pipeline for named entity recognition.
         label_map (dict): Mapping of NER labels to their meanings.
         shipping_info (dict): Dictionary containing detailed shipping information for products.
+        product_gazetteer (ProductGazetteer): Matcher for the products in shipping_info, tried before the NER model.
         bot_voice (pyttsx3.Engine): Text-to-speech engine for the bot's voice.
         user_voice (pyttsx3.Engine): Text-to-speech engine for the user's voice.
         device (torch.device): The device (CPU or GPU) to run the models on.
+        load_times (dict): Seconds spent in the constructor and loading each model component.
+        summary_cache_path (str): Path of the persisted shipping summary cache, or None.
+        summary_cache (dict): Shipping summaries keyed by a hash of the product text, model name and generation parameters.
+        multitask_model_path (str): Directory of the shared-encoder classifier, or None to use the separate models.
+        headless (bool): If True, text-to-speech and the pauses of run_test are disabled.
+        inference_backend (str): "torch" (eager float32), "int8" (dynamically quantized PyTorch) or "onnx" (ONNX Runtime).
+        onnx_model_dir (str): Directory of the graphs written by ExportModels.py, used by the "onnx" backend.
+        shipping_summary_params (dict): Generation parameters of the shipping summaries for the selected strategy.
+        cache_encoder_outputs (bool): If True, BART encoder outputs are reused for repeated summarization prompts.
+        max_batch_size (int): The maximum number of texts per forward pass in batched classification.
     """
 
-    def __init__(self):
+    def __init__(self, max_batch_size=32, warm_up=False, summary_cache_path=DEFAULT_SUMMARY_CACHE_PATH, multitask_model_path=None,
+                 headless=False, speech_queue_size=8, inference_backend="torch", onnx_model_dir=DEFAULT_ONNX_MODEL_DIR,
+                 summary_strategy="beam4", cache_encoder_outputs=False, encoder_cache_size=16):
         """
-        Initializes the CustomerServiceBot by loading all necessary models and tokenizers.
-        Prints a message when models are successfully loaded.
-        """
-        print("Loading models...")
+        Initializes the CustomerServiceBot. Models and tokenizers are loaded lazily on first use.
 
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        print(f"Using device: {self.device}")
+        Args:
+            max_batch_size (int): The maximum number of texts per forward pass in batched classification.
+            warm_up (bool): If True, starts loading all models concurrently in background threads.
+            summary_cache_path (str): JSON file persisting shipping summaries, or None to keep them in memory only.
+            multitask_model_path (str): Directory of a distilled MultiTaskClassifier (see DistillMultiTask.py).
+                                        If given, sentiment and question classification share one encoder pass.
+            headless (bool): If True, disables text-to-speech and pauses so conversations replay at full speed.
+            speech_queue_size (int): The maximum number of utterances waiting for the speech worker.
+            inference_backend (str): "torch", "int8" or "onnx". The int8 and ONNX backends target CPU inference;
+                                     the multi-task model has no ONNX export and runs in PyTorch under "onnx".
+            onnx_model_dir (str): Directory of the exported ONNX graphs for the "onnx" backend.
+            summary_strategy (str): Decoding of the shipping summaries: "beam4" (default), "beam2" or "greedy".
+            cache_encoder_outputs (bool): If True, keeps the BART encoder outputs of recent prompts so repeated
+                                          summarizations only run the decoder. Not available with the "onnx" backend.
+            encoder_cache_size (int): The maximum number of prompts whose encoder outputs are kept.
+        """
+        init_start = time.perf_counter()
+        self.max_batch_size = max_batch_size
+
+        if inference_backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend '{inference_backend}'; expected one of {INFERENCE_BACKENDS}.")
+        if inference_backend == "onnx" and ORTModelForSequenceClassification is None:
+            raise ImportError("The onnx inference backend requires optimum with ONNX Runtime: pip install optimum-onnx[onnxruntime]")
+        self.inference_backend = inference_backend
+        self.onnx_model_dir = onnx_model_dir
+
+        if inference_backend == "torch":
+            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        else:
+            self.device = torch.device("cpu")
+        print(f"Using device: {self.device} ({inference_backend} backend)")
 
         self.sentiment_model_name = "phanerozoic/BERT-Sentiment-Classifier"
-        self.sentiment_tokenizer = AutoTokenizer.from_pretrained(self.sentiment_model_name)
-        self.sentiment_model = BertForSequenceClassification.from_pretrained(self.sentiment_model_name).to(self.device)
-
         self.question_model_name = "phanerozoic/BERT-Question-Classifier"
-        self.question_tokenizer = AutoTokenizer.from_pretrained(self.question_model_name)
-        self.question_model = BertForSequenceClassification.from_pretrained(self.question_model_name).to(self.device)
-
         self.ner_model_name = "phanerozoic/BERT-NER-Classifier"
-        self.ner_tokenizer = BertTokenizerFast.from_pretrained(self.ner_model_name)
-        self.ner_model = AutoModelForTokenClassification.from_pretrained(self.ner_model_name).to(self.device)
-        self.nlp_ner = pipeline("ner", model=self.ner_model, tokenizer=self.ner_tokenizer, device=0 if self.device.type == "cuda" else -1)
-
-        print("BERT models loaded successfully.")
-
-        print("Loading BART summarizer...")
         self.summarizer_model_name = "phanerozoic/BART-Large-CNN-Enhanced"
-        self.summarizer_tokenizer = BartTokenizer.from_pretrained(self.summarizer_model_name)
-        self.summarizer_model = BartForConditionalGeneration.from_pretrained(self.summarizer_model_name).to(self.device)
-        print("BART summarizer loaded successfully.\n")
+        self.multitask_model_path = multitask_model_path
+
+        if summary_strategy not in SUMMARY_STRATEGIES:
+            raise ValueError(f"Unknown summary strategy '{summary_strategy}'; expected one of {list(SUMMARY_STRATEGIES)}.")
+        self.shipping_summary_params = {**SHIPPING_SUMMARY_PARAMS, **SUMMARY_STRATEGIES[summary_strategy]}
+        self.cache_encoder_outputs = cache_encoder_outputs and inference_backend != "onnx"
+        self.encoder_cache_size = encoder_cache_size
+        self._encoder_cache = OrderedDict()
+        self._encoder_cache_lock = threading.Lock()
+
+        # Models are loaded on first use; see _get_component and warm_up
+        self._component_loaders = {
+            "sentiment": self._load_sentiment,
+            "question": self._load_question,
+            "ner": self._load_ner,
+            "summarizer": self._load_summarizer,
+            "voices": self._load_voices,
+            "multitask": self._load_multitask,
+        }
+        self._components = {}
+        self._component_locks = {name: threading.Lock() for name in self._component_loaders}
+        self.load_times = {}
+        self._warm_up_executor = None
+
+        self.headless = headless
+        self._speech_queue = queue.Queue(maxsize=speech_queue_size)
+        self._speech_thread = None
 
         self.label_map = {
             "LABEL_0": "O",
@@ -131,12 +418,277 @@ class CustomerServiceBot:
             """
         }
 
-        self.bot_voice = pyttsx3.init()
-        self.user_voice = pyttsx3.init()
+        self.product_gazetteer = ProductGazetteer(self.shipping_info.keys())
+
+        self.summary_cache_path = summary_cache_path
+        self._summary_cache_lock = threading.Lock()
+        self.summary_cache = self.load_summary_cache()
+
+        self.load_times["init"] = time.perf_counter() - init_start
+        if warm_up:
+            self.warm_up(background=True)
+
+    sentiment_tokenizer = _lazy_component("sentiment", "tokenizer")
+    sentiment_model = _lazy_component("sentiment", "model")
+    question_tokenizer = _lazy_component("question", "tokenizer")
+    question_model = _lazy_component("question", "model")
+    ner_tokenizer = _lazy_component("ner", "tokenizer")
+    ner_model = _lazy_component("ner", "model")
+    nlp_ner = _lazy_component("ner", "pipeline")
+    summarizer_tokenizer = _lazy_component("summarizer", "tokenizer")
+    summarizer_model = _lazy_component("summarizer", "model")
+    bot_voice = _lazy_component("voices", "bot_voice")
+    user_voice = _lazy_component("voices", "user_voice")
+    multitask_tokenizer = _lazy_component("multitask", "tokenizer")
+    multitask_model = _lazy_component("multitask", "model")
+
+    def _quantize(self, model):
+        """Applies dynamic int8 quantization to the linear layers of a PyTorch model when the int8 backend is selected."""
+        if self.inference_backend != "int8":
+            return model
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def _load_model(self, component, model_name, model_class, onnx_class):
+        """
+        Loads a Hugging Face model for the configured inference backend.
+
+        Args:
+            component (str): The component name, which is also its subdirectory in onnx_model_dir.
+            model_name (str): The name of the pre-trained PyTorch model.
+            model_class (type): The transformers class of the PyTorch model.
+            onnx_class (type): The optimum ONNX Runtime class serving the exported graph.
+
+        Returns:
+            The loaded model.
+        """
+        if self.inference_backend == "onnx":
+            return onnx_class.from_pretrained(os.path.join(self.onnx_model_dir, component))
+        model = _from_pretrained(model_class, model_name)
+        return self._quantize(model.to(self.device))
+
+    def _load_sentiment(self):
+        """Loads the sentiment analysis tokenizer and model."""
+        tokenizer = AutoTokenizer.from_pretrained(self.sentiment_model_name)
+        model = self._load_model("sentiment", self.sentiment_model_name, BertForSequenceClassification, ORTModelForSequenceClassification)
+        return {"tokenizer": tokenizer, "model": model}
+
+    def _load_question(self):
+        """Loads the question classification tokenizer and model."""
+        tokenizer = AutoTokenizer.from_pretrained(self.question_model_name)
+        model = self._load_model("question", self.question_model_name, BertForSequenceClassification, ORTModelForSequenceClassification)
+        return {"tokenizer": tokenizer, "model": model}
+
+    def _load_ner(self):
+        """Loads the NER tokenizer and model and wraps them in a Hugging Face pipeline."""
+        tokenizer = BertTokenizerFast.from_pretrained(self.ner_model_name)
+        model = self._load_model("ner", self.ner_model_name, BertForTokenClassification, ORTModelForTokenClassification)
+        nlp_ner = pipeline("ner", model=model, tokenizer=tokenizer, device=0 if self.device.type == "cuda" else -1)
+        return {"tokenizer": tokenizer, "model": model, "pipeline": nlp_ner}
+
+    def _load_summarizer(self):
+        """Loads the BART summarization tokenizer and model."""
+        tokenizer = BartTokenizer.from_pretrained(self.summarizer_model_name)
+        model = self._load_model("summarizer", self.summarizer_model_name, BartForConditionalGeneration, ORTModelForSeq2SeqLM)
+        return {"tokenizer": tokenizer, "model": model}
+
+    def _load_multitask(self):
+        """Loads the distilled shared-encoder sentiment and question classifier."""
+        tokenizer = AutoTokenizer.from_pretrained(self.multitask_model_path)
+        model = MultiTaskClassifier.from_pretrained(self.multitask_model_path)
+        model = self._quantize(model.to(self.device))
+        return {"tokenizer": tokenizer, "model": model}
+
+    def _load_voices(self):
+        """Initializes the text-to-speech engines for the bot and the user."""
+        bot_voice = pyttsx3.init()
+        user_voice = pyttsx3.init()
+
+        voices = bot_voice.getProperty('voices')
+        bot_voice.setProperty('voice', voices[0].id)
+        user_voice.setProperty('voice', voices[1].id if len(voices) > 1 else voices[0].id)
+        return {"bot_voice": bot_voice, "user_voice": user_voice}
+
+    def _get_component(self, name):
+        """
+        Returns a model component, loading it on first use.
+
+        Each component has its own lock, so concurrent callers (e.g. a background warm-up and the
+        conversation thread) load it exactly once while other components load in parallel.
+
+        Args:
+            name (str): The component name ("sentiment", "question", "multitask", "ner", "summarizer" or "voices").
+
+        Returns:
+            dict: The loaded objects of the component.
+        """
+        component = self._components.get(name)
+        if component is not None:
+            return component
+        with self._component_locks[name]:
+            if name not in self._components:
+                print(f"Loading {name} model...")
+                start = time.perf_counter()
+                self._components[name] = self._component_loaders[name]()
+                self.load_times[name] = time.perf_counter() - start
+                print(f"{name.capitalize()} model loaded in {self.load_times[name]:.2f}s.")
+        return self._components[name]
+
+    def _configured_components(self):
+        """
+        Lists the components this configuration uses.
+
+        Returns:
+            list: The multitask model or the separate sentiment and question models, "ner" and
+                  "summarizer", plus "voices" unless running headless.
+        """
+        classifiers = ["multitask"] if self.multitask_model_path else ["sentiment", "question"]
+        return [*classifiers, "ner", "summarizer", *([] if self.headless else ["voices"])]
+
+    def warm_up(self, components=None, background=True):
+        """
+        Loads model components concurrently in worker threads ahead of their first use.
+
+        Downloading and reading checkpoints, tokenizers, device transfers and quantization overlap
+        across components; only instantiating each model takes turns on a lock (see _from_pretrained).
+
+        Args:
+            components (list): The components to load. Defaults to all models except the voices,
+                               since text-to-speech engines should be created on the thread that uses them.
+                               The summarizer is only loaded if the shipping summary cache has misses.
+            background (bool): If True, returns immediately while loading continues in the background.
+
+        Returns:
+            list: The futures of the loading tasks.
+        """
+        components = components or [name for name in self._configured_components() if name != "voices"]
+        self._warm_up_executor = ThreadPoolExecutor(max_workers=len(components), thread_name_prefix="warm-up")
+        futures = []
+        for name in components:
+            if name == "summarizer":
+                futures.append(self._warm_up_executor.submit(self.warm_summary_cache))
+            else:
+                futures.append(self._warm_up_executor.submit(self._get_component, name))
+        self._warm_up_executor.shutdown(wait=not background)
+        return futures
+
+    def startup_report(self):
+        """
+        Prints how long the constructor and each loaded model component took.
+
+        Returns:
+            dict: The load time in seconds per component, including "init" for the constructor.
+        """
+        print(Fore.CYAN + "Startup timing report:")
+        for name, seconds in self.load_times.items():
+            print(Fore.CYAN + f"  {name:<12}{seconds:>8.2f}s")
+        pending = [name for name in self._configured_components() if name not in self._components]
+        if pending:
+            print(Fore.CYAN + f"  Not loaded yet: {', '.join(pending)}")
+        return dict(self.load_times)
+
+    def _classify_batch(self, tokenizer, model, texts, max_batch_size=None):
+        """
+        Runs a sequence classifier over a list of texts in padded batches.
+
+        Texts are tokenized once, sorted by token length and grouped into buckets of at most
+        max_batch_size, so each batch is padded only to the length of its longest member.
+
+        Args:
+            tokenizer (AutoTokenizer): The tokenizer of the classification model.
+            model (BertForSequenceClassification): The classification model.
+            texts (list): The input texts.
+            max_batch_size (int): The maximum number of texts per forward pass. Defaults to self.max_batch_size.
+
+        Returns:
+            torch.Tensor: Class probabilities of shape (len(texts), num_labels), in input order.
+                          For a MultiTaskClassifier, a dict of such tensors per task.
+        """
+        if not texts:
+            return {task: torch.empty(0) for task in model.heads} if isinstance(model, MultiTaskClassifier) else torch.empty(0)
+
+        max_batch_size = max_batch_size or self.max_batch_size
+        encodings = tokenizer(list(texts), truncation=True)
+        order = sorted(range(len(texts)), key=lambda i: len(encodings["input_ids"][i]))
+        probs = [None] * len(texts)
+
+        with torch.inference_mode():
+            for start in range(0, len(order), max_batch_size):
+                bucket = order[start:start + max_batch_size]
+                features = [{key: encodings[key][i] for key in encodings.keys()} for i in bucket]
+                inputs = tokenizer.pad(features, return_tensors="pt").to(self.device)
+                outputs = model(**inputs)
+                if isinstance(model, MultiTaskClassifier):
+                    task_probs = {task: logits.softmax(dim=-1).cpu() for task, logits in outputs.items()}
+                    for j, i in enumerate(bucket):
+                        probs[i] = {task: p[j] for task, p in task_probs.items()}
+                else:
+                    for i, p in zip(bucket, outputs.logits.softmax(dim=-1).cpu()):
+                        probs[i] = p
+
+        if isinstance(model, MultiTaskClassifier):
+            return {task: torch.stack([p[task] for p in probs]) for task in model.heads}
+        return torch.stack(probs)
+
+    def _sentiment_results(self, probs):
+        """Converts sentiment probabilities into (sentiment, sentiment score) tuples."""
+        results = []
+        for p in probs:
+            sentiment_score = p[1].item()
+            sentiment = "Positive" if sentiment_score > 0.5 else "Negative"
+            results.append((sentiment, sentiment_score))
+        return results
+
+    def classify_turn_batch(self, texts, max_batch_size=None):
+        """
+        Analyzes sentiment and classifies the question type of a list of texts.
+
+        With a multi-task model both results come from a single shared encoder pass per text;
+        otherwise the separate sentiment and question classifiers are run.
+
+        Args:
+            texts (list): The input texts.
+            max_batch_size (int): The maximum number of texts per forward pass. Defaults to self.max_batch_size.
+
+        Returns:
+            list: A (sentiment, sentiment score, question type) tuple per input text, in input order.
+        """
+        if self.multitask_model_path:
+            probs = self._classify_batch(self.multitask_tokenizer, self.multitask_model, texts, max_batch_size)
+            sentiments = self._sentiment_results(probs["sentiment"])
+            question_types = [QUESTION_LABELS[p.argmax().item()] for p in probs["question"]]
+        else:
+            sentiments = self.analyze_sentiment_batch(texts, max_batch_size)
+            question_types = self.classify_question_batch(texts, max_batch_size)
+        return [(sentiment, score, question_type) for (sentiment, score), question_type in zip(sentiments, question_types)]
+
+    def classify_turn(self, text):
+        """
+        Analyzes the sentiment and classifies the question type of a single user turn.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            tuple: The sentiment (str), the sentiment score (float) and the question type (str).
+        """
+        return self.classify_turn_batch([text])[0]
+
+    def analyze_sentiment_batch(self, texts, max_batch_size=None):
+        """
+        Analyzes the sentiment of a list of texts using batched inference with the BERT sentiment classifier.
+
+        Args:
+            texts (list): The input texts to analyze.
+            max_batch_size (int): The maximum number of texts per forward pass. Defaults to self.max_batch_size.
 
-        voices = self.bot_voice.getProperty('voices')
-        self.bot_voice.setProperty('voice', voices[0].id)
-        self.user_voice.setProperty('voice', voices[1].id if len(voices) > 1 else voices[0].id)
+        Returns:
+            list: A (sentiment, sentiment score) tuple per input text, in input order.
+        """
+        if self.multitask_model_path:
+            probs = self._classify_batch(self.multitask_tokenizer, self.multitask_model, texts, max_batch_size)["sentiment"]
+        else:
+            probs = self._classify_batch(self.sentiment_tokenizer, self.sentiment_model, texts, max_batch_size)
+        return self._sentiment_results(probs)
 
     def analyze_sentiment(self, text):
         """
@@ -149,12 +701,24 @@ class CustomerServiceBot:
             tuple: A tuple containing the sentiment (str) and the sentiment score (float).
                    Sentiment is either "Positive" or "Negative".
         """
-        inputs = self.sentiment_tokenizer(text, return_tensors="pt").to(self.device)
-        outputs = self.sentiment_model(**inputs)
-        probs = outputs.logits.softmax(dim=-1)
-        sentiment_score = probs[0][1].item()
-        sentiment = "Positive" if sentiment_score > 0.5 else "Negative"
-        return sentiment, sentiment_score
+        return self.analyze_sentiment_batch([text])[0]
+
+    def classify_question_batch(self, texts, max_batch_size=None):
+        """
+        Classifies the question type of a list of texts using batched inference with the BERT question classifier.
+
+        Args:
+            texts (list): The input texts to classify.
+            max_batch_size (int): The maximum number of texts per forward pass. Defaults to self.max_batch_size.
+
+        Returns:
+            list: The classified question type (str) per input text, in input order.
+        """
+        if self.multitask_model_path:
+            probs = self._classify_batch(self.multitask_tokenizer, self.multitask_model, texts, max_batch_size)["question"]
+        else:
+            probs = self._classify_batch(self.question_tokenizer, self.question_model, texts, max_batch_size)
+        return [QUESTION_LABELS[p.argmax().item()] for p in probs]
 
     def classify_question(self, text):
         """
@@ -166,13 +730,7 @@ class CustomerServiceBot:
         Returns:
             str: The classified question type (e.g., "Description", "Entity", "Expression", etc.).
         """
-        inputs = self.question_tokenizer(text, return_tensors="pt").to(self.device)
-        outputs = self.question_model(**inputs)
-        probs = outputs.logits.softmax(dim=-1)
-        class_id = probs.argmax().item()
-        label_map = {0: "Description", 1: "Entity", 2: "Expression", 3: "Human", 4: "Location", 5: "Numeric"}
-        query_type = label_map[class_id]
-        return query_type
+        return self.classify_question_batch([text])[0]
 
     def extract_order_number(self, text):
         """
@@ -200,20 +758,16 @@ class CustomerServiceBot:
         entity = entity.replace("3000", "").replace("4000", "").strip()
         return entity
 
-    def extract_entities(self, text):
+    def _stitch_entities(self, results):
         """
-        Extracts named entities from the given text using the BERT NER model.
-
-        This method processes the NER results, combines multi-word entities,
-        and cleans the extracted entities.
+        Combines word-piece NER results into multi-word entities and cleans them.
 
         Args:
-            text (str): The input text from which to extract entities.
+            results (list): The NER pipeline output for one text.
 
         Returns:
-            list: A list of cleaned and extracted entity strings.
+            tuple: The formatted word-level results (list) and the cleaned entity strings (list).
         """
-        results = self.nlp_ner(text)
         formatted_results = []
         for result in results:
             if result['word'].startswith('##'):
@@ -248,11 +802,153 @@ class CustomerServiceBot:
         if current_entity:
             entities.append(self.clean_entity(current_entity.strip()))
 
+        return formatted_results, entities
+
+    def extract_entities_batch(self, texts, max_batch_size=None):
+        """
+        Extracts named entities from a list of texts, running batched NER inference only on the texts
+        in which the product gazetteer finds no known product.
+
+        Args:
+            texts (list): The input texts from which to extract entities.
+            max_batch_size (int): The maximum number of texts per forward pass. Defaults to self.max_batch_size.
+
+        Returns:
+            list: The list of cleaned entity strings per input text, in input order.
+        """
+        entities = [self.product_gazetteer.find_all(text) for text in texts]
+        misses = [i for i, products in enumerate(entities) if not products]
+        if misses:
+            results = self.nlp_ner([texts[i] for i in misses], batch_size=max_batch_size or self.max_batch_size)
+            for i, result in zip(misses, results):
+                entities[i] = self._stitch_entities(result)[1]
+        return entities
+
+    def extract_entities(self, text):
+        """
+        Extracts named entities from the given text using the BERT NER model.
+
+        Known products are matched by the product gazetteer first; only if none is found does this
+        method run the NER model, combine multi-word entities and clean the extracted entities.
+
+        Args:
+            text (str): The input text from which to extract entities.
+
+        Returns:
+            list: A list of cleaned and extracted entity strings.
+        """
+        products = self.product_gazetteer.find_all(text)
+        if products:
+            print(Fore.CYAN + f"Gazetteer Matched Products: {products}")
+            return products
+
+        formatted_results, entities = self._stitch_entities(self.nlp_ner(text))
+
         print(Fore.CYAN + f"Extracted Entities Output: {formatted_results}")
         print(Fore.CYAN + f"Final Extracted Entities: {entities}")
         return entities
 
-    def summarize_text(self, text, max_length=150, min_length=40):
+    def summarize_text_batch(self, texts, max_length=150, min_length=40, num_beams=4, length_penalty=2.0):
+        """
+        Summarizes a list of texts in one padded generation call and formats the outputs.
+
+        Args:
+            texts (list): The input texts to summarize.
+            max_length (int): The maximum length of each summary.
+            min_length (int): The minimum length of each summary.
+            num_beams (int): The number of beams for beam search.
+            length_penalty (float): The exponential length penalty applied during beam search.
+
+        Returns:
+            list: The generated summaries, each formatted as a single paragraph, in input order.
+        """
+        if not texts:
+            return []
+        generation_inputs = self._summarizer_inputs(texts)
+        with torch.inference_mode():
+            # num_beams is always explicit, since BART checkpoints default to beam search in their generation config.
+            beam_kwargs = {"length_penalty": length_penalty} if num_beams > 1 else {}
+            summary_ids = self.summarizer_model.generate(**generation_inputs, num_beams=num_beams, **beam_kwargs,
+                                                         max_length=max_length, min_length=min_length)
+        return [self._format_summary(summary) for summary in self.summarizer_tokenizer.batch_decode(summary_ids, skip_special_tokens=True)]
+
+    def _format_summary(self, summary):
+        """Formats a generated summary as a single paragraph of capitalized sentences."""
+        summary = summary.replace("\n", " ").strip()
+        sentences = [s.strip().capitalize() for s in summary.split('.') if s.strip()]
+        return ". ".join(sentences) + "."
+
+    def _summarizer_inputs(self, texts):
+        """
+        Tokenizes texts for generation and, with encoder-output caching, attaches the cached encoder outputs.
+
+        The cache is keyed by the exact batch of texts, so a repeated prompt skips the encoder entirely.
+
+        Args:
+            texts (list): The input texts to summarize.
+
+        Returns:
+            dict: Keyword arguments for the summarizer's generate method.
+        """
+        inputs = self.summarizer_tokenizer(list(texts), max_length=1024, return_tensors="pt", truncation=True, padding=True).to(self.device)
+        generation_inputs = {"input_ids": inputs["input_ids"], "attention_mask": inputs["attention_mask"]}
+        if not self.cache_encoder_outputs:
+            return generation_inputs
+
+        key = hashlib.sha256("\0".join(texts).encode("utf-8")).hexdigest()
+        with self._encoder_cache_lock:
+            hidden_states = self._encoder_cache.get(key)
+            if hidden_states is not None:
+                self._encoder_cache.move_to_end(key)
+        if hidden_states is None:
+            with torch.inference_mode():
+                hidden_states = self.summarizer_model.get_encoder()(**generation_inputs).last_hidden_state
+            with self._encoder_cache_lock:
+                self._encoder_cache[key] = hidden_states
+                while len(self._encoder_cache) > self.encoder_cache_size:
+                    self._encoder_cache.popitem(last=False)
+
+        # generate expands the encoder outputs for beam search in place, so each call gets a fresh wrapper
+        generation_inputs["encoder_outputs"] = BaseModelOutput(last_hidden_state=hidden_states)
+        return generation_inputs
+
+    def stream_summary(self, text, max_length=150, min_length=40):
+        """
+        Summarizes the given text and yields the summary incrementally as tokens are decoded.
+
+        Generation runs on a background thread with greedy decoding, since beam search only
+        knows its best sequence once generation has finished.
+
+        Args:
+            text (str): The input text to summarize.
+            max_length (int): The maximum length of the summary.
+            min_length (int): The minimum length of the summary.
+
+        Yields:
+            str: The next decoded piece of the summary.
+        """
+        streamer = TextIteratorStreamer(self.summarizer_tokenizer, skip_special_tokens=True)
+        generation_kwargs = {**self._summarizer_inputs([text]), "num_beams": 1, "max_length": max_length, "min_length": min_length, "streamer": streamer}
+        errors = []
+
+        def generate():
+            try:
+                with torch.inference_mode():
+                    self.summarizer_model.generate(**generation_kwargs)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        thread = threading.Thread(target=generate, name="summary-stream", daemon=True)
+        thread.start()
+        for chunk in streamer:
+            if chunk:
+                yield chunk.replace("\n", " ")
+        thread.join()
+        if errors:
+            raise errors[0]
+
+    def summarize_text(self, text, max_length=150, min_length=40, num_beams=4, length_penalty=2.0):
         """
         Summarizes the given text using the BART summarization model and formats the output.
 
@@ -260,19 +956,13 @@ class CustomerServiceBot:
             text (str): The input text to summarize.
             max_length (int): The maximum length of the summary.
             min_length (int): The minimum length of the summary.
+            num_beams (int): The number of beams for beam search.
+            length_penalty (float): The exponential length penalty applied during beam search.
 
         Returns:
             str: The generated summary, properly formatted as a single paragraph.
         """
-        inputs = self.summarizer_tokenizer([text], max_length=1024, return_tensors="pt", truncation=True).to(self.device)
-        summary_ids = self.summarizer_model.generate(inputs["input_ids"], num_beams=4, max_length=max_length, min_length=min_length, length_penalty=2.0)
-        summary = self.summarizer_tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-
-        summary = summary.replace("\n", " ").strip()
-        sentences = [s.strip().capitalize() for s in summary.split('.') if s.strip()]
-        formatted_summary = ". ".join(sentences) + "."
-
-        return formatted_summary
+        return self.summarize_text_batch([text], max_length, min_length, num_beams, length_penalty)[0]
 
     def get_shipping_info(self, product):
         """
@@ -284,13 +974,152 @@ class CustomerServiceBot:
         Returns:
             str: A summary of the shipping information or an error message if the product is not found.
         """
+        return self.get_shipping_info_batch([product])[0]
+
+    def stream_shipping_info(self, product):
+        """
+        Yields the shipping summary of a product incrementally, streaming it from the summarizer on a cache miss.
+
+        A cached summary, from either the configured strategy or an earlier stream, is yielded at once.
+        A streamed summary is decoded greedily and cached under the greedy generation parameters.
+
+        Args:
+            product (str): The name of the product to retrieve shipping information for.
+
+        Yields:
+            str: The next piece of the summary, or an error message if the product is not found.
+        """
         product_key = next((key for key in self.shipping_info.keys() if key.lower() == product.lower()), None)
-        if product_key:
-            full_info = self.shipping_info[product_key]
-            summary = self.summarize_text(full_info, max_length=200, min_length=100)
-            return summary
-        else:
-            return "I'm sorry, I don't have shipping information about that product."
+        if not product_key:
+            yield "I'm sorry, I don't have shipping information about that product."
+            return
+
+        text = self.shipping_info[product_key]
+        stream_params = {**self.shipping_summary_params, **SUMMARY_STRATEGIES["greedy"]}
+        stream_key = self.summary_cache_key(text, stream_params)
+        for key in (self.summary_cache_key(text), stream_key):
+            entry = self.summary_cache.get(key)
+            if entry is not None:
+                yield entry["summary"]
+                return
+
+        chunks = []
+        for chunk in self.stream_summary(text, max_length=stream_params["max_length"], min_length=stream_params["min_length"]):
+            chunks.append(chunk)
+            yield chunk
+        with self._summary_cache_lock:
+            self.summary_cache[stream_key] = {"product": product_key, "text_sha256": self._text_hash(text), "summary": self._format_summary("".join(chunks))}
+        self.save_summary_cache()
+
+    def get_shipping_info_batch(self, products):
+        """
+        Retrieves the shipping summaries of several products, summarizing all cache misses in one batch.
+
+        Args:
+            products (list): The product names to retrieve shipping information for.
+
+        Returns:
+            list: A summary or an error message per product, in input order.
+        """
+        product_keys = [next((key for key in self.shipping_info.keys() if key.lower() == product.lower()), None) for product in products]
+        found = list(dict.fromkeys(key for key in product_keys if key))
+        summaries = dict(zip(found, self.cached_shipping_summaries(found))) if found else {}
+        return [summaries[key] if key else "I'm sorry, I don't have shipping information about that product." for key in product_keys]
+
+    def _text_hash(self, text):
+        """Returns the SHA-256 hex digest of a text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def summary_cache_key(self, text, params=None):
+        """
+        Computes the cache key of a summary, so that any change to the text, model, inference backend or generation parameters invalidates it.
+
+        Args:
+            text (str): The text to summarize.
+            params (dict): The generation parameters passed to summarize_text. Defaults to shipping_summary_params.
+
+        Returns:
+            str: The SHA-256 hex digest identifying the summary.
+        """
+        params = params or self.shipping_summary_params
+        payload = json.dumps({"text": text, "model": self.summarizer_model_name, "backend": self.inference_backend, "params": params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load_summary_cache(self):
+        """
+        Loads the persisted shipping summaries from disk.
+
+        Returns:
+            dict: The cached summaries, or an empty dict if there is no readable cache file.
+        """
+        if not self.summary_cache_path or not os.path.exists(self.summary_cache_path):
+            return {}
+        try:
+            with open(self.summary_cache_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("summaries", {})
+        except (OSError, ValueError) as e:
+            print(Fore.RED + f"Ignoring unreadable summary cache {self.summary_cache_path}: {e}")
+            return {}
+
+    def save_summary_cache(self):
+        """Writes the shipping summaries to disk atomically, so readers never see a partial file."""
+        if not self.summary_cache_path:
+            return
+        with self._summary_cache_lock:
+            snapshot = dict(self.summary_cache)
+        temp_path = f"{self.summary_cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"summaries": snapshot}, f, indent=2)
+        os.replace(temp_path, self.summary_cache_path)
+
+    def cached_shipping_summaries(self, product_keys, persist=True):
+        """
+        Returns the shipping summaries of products, generating only the cache misses in a single batch.
+
+        Args:
+            product_keys (list): Product names as they appear in shipping_info.
+            persist (bool): If True, writes the cache to disk after a miss.
+
+        Returns:
+            list: The summarized shipping information per product, in input order.
+        """
+        keys = [self.summary_cache_key(self.shipping_info[product_key]) for product_key in product_keys]
+        missing = {key: product_key for key, product_key in zip(keys, product_keys) if key not in self.summary_cache}
+
+        if missing:
+            summaries = self.summarize_text_batch([self.shipping_info[product_key] for product_key in missing.values()], **self.shipping_summary_params)
+            with self._summary_cache_lock:
+                for (key, product_key), summary in zip(missing.items(), summaries):
+                    self.summary_cache[key] = {"product": product_key, "text_sha256": self._text_hash(self.shipping_info[product_key]), "summary": summary}
+            if persist:
+                self.save_summary_cache()
+        return [self.summary_cache[key]["summary"] for key in keys]
+
+    def warm_summary_cache(self):
+        """
+        Summarizes every product whose shipping text has no cached summary and drops stale entries.
+
+        An entry is stale when its product was removed or its shipping text changed; summaries of the
+        current texts under other generation parameters are kept. The summarizer is only loaded when
+        at least one product is missing from the cache.
+
+        Returns:
+            int: The number of summaries that had to be generated.
+        """
+        current_keys = {self.summary_cache_key(text): product for product, text in self.shipping_info.items()}
+        missing = [product for key, product in current_keys.items() if key not in self.summary_cache]
+        if missing:
+            print(f"Summarizing shipping information for {', '.join(missing)}...")
+            self.cached_shipping_summaries(missing, persist=False)
+
+        text_hashes = {product: self._text_hash(text) for product, text in self.shipping_info.items()}
+        with self._summary_cache_lock:
+            stale = [key for key, entry in self.summary_cache.items() if entry.get("text_sha256") != text_hashes.get(entry["product"])]
+            for key in stale:
+                del self.summary_cache[key]
+        if missing or stale:
+            self.save_summary_cache()
+        return len(missing)
 
     def welcome_message(self):
         """
@@ -356,17 +1185,95 @@ class CustomerServiceBot:
         shipping_summary = self.get_shipping_info(product)
         return f"Here's what I can tell you about shipping for the {product}: {shipping_summary}"
 
+    def _speech_worker(self):
+        """Speaks queued utterances in order; the text-to-speech engines are created and used only on this thread."""
+        while True:
+            item = self._speech_queue.get()
+            try:
+                if item is None:
+                    return
+                speaker, text = item
+                voice = self.bot_voice if speaker == "bot" else self.user_voice
+                voice.say(text)
+                voice.runAndWait()
+            except Exception as e:
+                print(Fore.RED + f"Speech synthesis failed: {e}")
+            finally:
+                self._speech_queue.task_done()
+
+    def _enqueue_speech(self, speaker, text):
+        """
+        Queues an utterance for the background speech worker, starting the worker on first use.
+
+        Blocks while the queue is full, so the conversation never runs more than speech_queue_size
+        utterances ahead of the audio.
+
+        Args:
+            speaker (str): "bot" or "user".
+            text (str): The text to speak.
+        """
+        if self.headless:
+            return
+        if self._speech_thread is None:
+            self._speech_thread = threading.Thread(target=self._speech_worker, name="speech", daemon=True)
+            self._speech_thread.start()
+        self._speech_queue.put((speaker, text))
+
+    def wait_for_speech(self):
+        """Blocks until every queued utterance has been spoken."""
+        if self._speech_thread is not None:
+            self._speech_queue.join()
+
+    def shutdown_speech(self):
+        """Finishes the queued utterances and stops the speech worker."""
+        if self._speech_thread is not None:
+            self._speech_queue.put(None)
+            self._speech_thread.join()
+            self._speech_thread = None
+
+    def pause(self, seconds):
+        """Waits between conversation steps, unless running headless."""
+        if not self.headless:
+            time.sleep(seconds)
+
     def speak_bot(self, text):
         """Speak the bot's response"""
         print(Fore.YELLOW + f"Bot: {text}")
-        self.bot_voice.say(text)
-        self.bot_voice.runAndWait()
+        self._enqueue_speech("bot", text)
+
+    def speak_bot_stream(self, chunks, prefix=""):
+        """
+        Prints the bot's response as it is generated and speaks each sentence once it is complete.
+
+        Args:
+            chunks (iterable): The pieces of the response after the prefix.
+            prefix (str): Text that precedes the streamed pieces.
+
+        Returns:
+            str: The full response.
+        """
+        # Wait for the first piece so lazy model loading does not interrupt the printed line.
+        chunks = iter(chunks)
+        first_chunk = next(chunks, "")
+        print(Fore.YELLOW + f"Bot: {prefix}", end="", flush=True)
+        text = prefix
+        spoken = 0
+        for chunk in itertools.chain([first_chunk], chunks):
+            print(Fore.YELLOW + chunk, end="", flush=True)
+            text += chunk
+            sentence_end = text.rfind(". ") + 1
+            if sentence_end > spoken:
+                self._enqueue_speech("bot", text[spoken:sentence_end])
+                spoken = sentence_end
+        print()
+        if text[spoken:].strip():
+            self._enqueue_speech("bot", text[spoken:])
+        return text
 
     def speak_user(self, text):
         """Speak the user's input"""
         print(Fore.GREEN + f"User: {text}")
-        self.user_voice.say(text)
-        self.user_voice.runAndWait()
+        self._enqueue_speech("user", text)
 
     def run_test(self):
         """
@@ -375,70 +1282,92 @@ class CustomerServiceBot:
         This method simulates a conversation with a user, demonstrating the bot's
         ability to greet, analyze sentiment, process order numbers, confirm order items,
         and provide summarized shipping information. It uses color-coded output for better readability.
+        Speech is synthesized in the background while the next turn is processed; in headless mode
+        speech and pauses are skipped.
         """
         self.speak_bot(self.welcome_message())
-        time.sleep(2)
+        self.pause(2)
 
         initial_query = random.choice([
             "Hi, I just wanted to check on my order status. Everything has been great so far!",
             "Hi, I haven't received my order yet and I'm getting frustrated."
         ])
         self.speak_user(initial_query)
-        time.sleep(2)
+        self.pause(2)
 
         sentiment, sentiment_score = self.analyze_sentiment(initial_query)
         sentiment_color = Fore.BLUE if sentiment == "Positive" else Fore.RED
         print(f"{sentiment_color}Sentiment: {sentiment} (Score: {sentiment_score:.2f})")
-        time.sleep(2)
+        self.pause(2)
 
         bot_response = self.initial_bot_response(sentiment)
         self.speak_bot(bot_response)
-        time.sleep(2)
+        self.pause(2)
 
         order_number = str(random.randint(1000, 9999))
         follow_up_query = f"Sure, the order number is {order_number}."
         self.speak_user(follow_up_query)
-        time.sleep(2)
+        self.pause(2)
 
         query_type = self.classify_question(follow_up_query)
         print(Fore.CYAN + f"Query Type: {query_type}")
         extracted_order_number = self.extract_order_number(follow_up_query)
         print(Fore.CYAN + f"Extracted Order Number: {extracted_order_number}")
-        time.sleep(2)
+        self.pause(2)
 
         bot_response = self.order_number_response(extracted_order_number)
         self.speak_bot(bot_response)
-        time.sleep(2)
+        self.pause(2)
 
         bot_response = "Can you confirm the items in your order?"
         self.speak_bot(bot_response)
-        time.sleep(2)
+        self.pause(2)
 
         confirmation_query = random.choice([
             "I ordered the GizmoTron.",
             "I ordered the Thingamajig."
         ])
         self.speak_user(confirmation_query)
-        time.sleep(2)
+        self.pause(2)
 
         entities = self.extract_entities(confirmation_query)
-        time.sleep(2)
+        self.pause(2)
 
         bot_response = self.item_confirmation_response(entities)
         self.speak_bot(bot_response)
-        time.sleep(2)
+        self.pause(2)
 
         self.speak_user("When will my order be shipped?")
-        time.sleep(2)
+        self.pause(2)
 
-        shipping_response = self.shipping_info_response(entities[0])
-        self.speak_bot(shipping_response)
+        self.speak_bot_stream(self.stream_shipping_info(entities[0]), f"Here's what I can tell you about shipping for the {entities[0]}: ")
 
-        time.sleep(2)
+        self.pause(2)
         self.speak_user("Thank you!")
-        time.sleep(1)
+        self.pause(1)
         print(Fore.CYAN + "[User has disconnected]")
+        self.shutdown_speech()
 
 if __name__ == "__main__":
-    bot = CustomerServiceBot()
-    bot.run_test()
+    parser = argparse.ArgumentParser(description="Run the Acme customer service chatbot simulation.")
+    parser.add_argument("--summary-cache", default=DEFAULT_SUMMARY_CACHE_PATH, help="Path of the persisted shipping summary cache.")
+    parser.add_argument("--build-summary-cache", action="store_true", help="Precompute the shipping summaries offline and exit.")
+    parser.add_argument("--multitask-model", default=None, help="Directory of a distilled shared-encoder classifier to use instead of the separate models.")
+    parser.add_argument("--headless", action="store_true", help="Disable text-to-speech and pauses to replay the conversation at full speed.")
+    parser.add_argument("--backend", choices=INFERENCE_BACKENDS, default="torch", help="Inference backend for the models.")
+    parser.add_argument("--onnx-model-dir", default=DEFAULT_ONNX_MODEL_DIR, help="Directory of the graphs exported by ExportModels.py.")
+    parser.add_argument("--summary-strategy", choices=list(SUMMARY_STRATEGIES), default="beam4", help="Decoding of the shipping summaries.")
+    parser.add_argument("--cache-encoder-outputs", action="store_true", help="Reuse BART encoder outputs for repeated summarization prompts.")
+    args = parser.parse_args()
+
+    if args.build_summary_cache:
+        bot = CustomerServiceBot(summary_cache_path=args.summary_cache, inference_backend=args.backend,
+                                 onnx_model_dir=args.onnx_model_dir, summary_strategy=args.summary_strategy)
+        generated = bot.warm_summary_cache()
+        print(f"Summary cache {args.summary_cache} is up to date ({generated} summaries generated).")
+    else:
+        bot = CustomerServiceBot(warm_up=True, summary_cache_path=args.summary_cache, multitask_model_path=args.multitask_model,
+                                 headless=args.headless, inference_backend=args.backend, onnx_model_dir=args.onnx_model_dir,
+                                 summary_strategy=args.summary_strategy, cache_encoder_outputs=args.cache_encoder_outputs)
+        bot.run_test()
+        bot.startup_report()
@@ -0,0 +1,337 @@
+import argparse
+import asyncio
+import itertools
+import random
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from ServiceSim import CustomerServiceBot, DEFAULT_ONNX_MODEL_DIR, INFERENCE_BACKENDS
+
+class MicroBatchScheduler:
+    """
+    Collects model requests from all sessions into micro-batches and runs them on a single worker thread.
+
+    Each task has its own queue. A batch is dispatched once it holds max_batch_size requests or the oldest
+    request has waited max_wait seconds, so light load keeps latency low while heavy load fills the batches.
+
+    Attributes:
+        bot (CustomerServiceBot): The bot whose batched methods serve the requests.
+        max_batch_size (int): The maximum number of requests per dispatched batch.
+        max_wait (float): The longest time in seconds a request waits for its batch to fill.
+        handlers (dict): Mapping of task name to the batched bot method serving it.
+        batch_sizes (dict): The sizes of all dispatched batches per task.
+    """
+
+    def __init__(self, bot, max_batch_size=None, max_wait=0.01):
+        """
+        Initializes the MicroBatchScheduler.
+
+        Args:
+            bot (CustomerServiceBot): The bot whose models serve the requests.
+            max_batch_size (int): The maximum number of requests per batch. Defaults to bot.max_batch_size.
+            max_wait (float): The batching deadline in seconds.
+        """
+        self.bot = bot
+        self.max_batch_size = max_batch_size or bot.max_batch_size
+        self.max_wait = max_wait
+        self.handlers = {
+            "sentiment": bot.analyze_sentiment_batch,
+            "ner": bot.extract_entities_batch,
+            "summarization": bot.get_shipping_info_batch,
+        }
+        self.batch_sizes = {task: [] for task in self.handlers}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-worker")
+        self._queues = {}
+        self._workers = []
+
+    def start(self):
+        """Starts one batching loop per task on the running event loop."""
+        self._queues = {task: asyncio.Queue() for task in self.handlers}
+        self._workers = [asyncio.create_task(self._batch_loop(task)) for task in self.handlers]
+
+    async def stop(self):
+        """Cancels the batching loops and waits for the model worker thread to finish."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, task, item):
+        """
+        Queues a request and waits for its result.
+
+        Args:
+            task (str): The task name ("sentiment", "ner" or "summarization").
+            item (str): The text or product name to process.
+
+        Returns:
+            The result of the batched bot method for this item.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queues[task].put((item, future))
+        return await future
+
+    async def _batch_loop(self, task):
+        """Forms batches for one task and dispatches them to the model worker thread."""
+        loop = asyncio.get_running_loop()
+        queue = self._queues[task]
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self.handlers[task], items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batch_sizes[task].append(len(batch))
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+class ConversationSession:
+    """
+    The state of one customer conversation.
+
+    Attributes:
+        session_id (int): The unique session identifier.
+        stage (str): The conversation step: "greeting", "order_number", "items" or "questions".
+        sentiment (str): The sentiment of the customer's opening message.
+        order_number (str): The extracted order number.
+        items (list): The confirmed order items.
+        history (list): (speaker, text) tuples of the conversation so far.
+    """
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.stage = "greeting"
+        self.sentiment = None
+        self.order_number = None
+        self.items = []
+        self.history = []
+
+class ServiceSimServer:
+    """
+    Asyncio front end serving many concurrent customer conversations with a shared CustomerServiceBot.
+
+    Conversations follow the same steps as CustomerServiceBot.run_test, but only the model a reply depends on
+    is run (sentiment for the greeting, NER for the items, the summarizer for shipping questions), and it
+    goes through the MicroBatchScheduler so requests from different sessions share forward passes.
+
+    Attributes:
+        bot (CustomerServiceBot): The bot providing the models and responses.
+        scheduler (MicroBatchScheduler): The micro-batching scheduler.
+        sessions (dict): The open sessions keyed by session id.
+    """
+
+    def __init__(self, bot, scheduler):
+        """
+        Initializes the ServiceSimServer.
+
+        Args:
+            bot (CustomerServiceBot): The bot providing the models and responses.
+            scheduler (MicroBatchScheduler): The scheduler batching model requests.
+        """
+        self.bot = bot
+        self.scheduler = scheduler
+        self.sessions = {}
+        self._session_ids = itertools.count(1)
+
+    def open_session(self):
+        """
+        Creates a new conversation.
+
+        Returns:
+            tuple: The new session and the bot's welcome message.
+        """
+        session = ConversationSession(next(self._session_ids))
+        self.sessions[session.session_id] = session
+        welcome = self.bot.welcome_message()
+        session.history.append(("bot", welcome))
+        return session, welcome
+
+    def close_session(self, session_id):
+        """Forgets a finished conversation."""
+        self.sessions.pop(session_id, None)
+
+    async def handle_message(self, session_id, text):
+        """
+        Processes one customer message and advances the conversation.
+
+        Args:
+            session_id (int): The session the message belongs to.
+            text (str): The customer's message.
+
+        Returns:
+            str: The bot's reply.
+        """
+        session = self.sessions[session_id]
+        session.history.append(("user", text))
+
+        if session.stage == "greeting":
+            session.sentiment, _ = await self.scheduler.submit("sentiment", text)
+            reply = self.bot.initial_bot_response(session.sentiment)
+            session.stage = "order_number"
+        elif session.stage == "order_number":
+            session.order_number = self.bot.extract_order_number(text)
+            if session.order_number:
+                reply = f"{self.bot.order_number_response(session.order_number)} Can you confirm the items in your order?"
+                session.stage = "items"
+            else:
+                reply = "I couldn't find an order number in your message. Could you please provide it?"
+        elif session.stage == "items":
+            session.items = await self.scheduler.submit("ner", text)
+            reply = self.bot.item_confirmation_response(session.items)
+            if session.items:
+                session.stage = "questions"
+        elif re.search(r"\b(ship|deliver)", text, re.IGNORECASE):
+            product = session.items[0]
+            shipping_summary = await self.scheduler.submit("summarization", product)
+            reply = f"Here's what I can tell you about shipping for the {product}: {shipping_summary}"
+        else:
+            reply = "You're welcome! Is there anything else I can help you with?"
+
+        session.history.append(("bot", reply))
+        return reply
+
+    async def handle_connection(self, reader, writer):
+        """Serves one TCP client as one session; each line sent is a customer message."""
+        session, welcome = self.open_session()
+        try:
+            writer.write(f"{welcome}\n".encode("utf-8"))
+            await writer.drain()
+            while line := await reader.readline():
+                text = line.decode("utf-8").strip()
+                if text:
+                    writer.write(f"{await self.handle_message(session.session_id, text)}\n".encode("utf-8"))
+                    await writer.drain()
+        except Exception as e:
+            print(f"Session {session.session_id} failed: {e}")
+            traceback.print_exc()
+        finally:
+            self.close_session(session.session_id)
+            writer.close()
+
+async def simulate_conversation(server):
+    """
+    Runs the scripted run_test conversation against the server without text-to-speech or pauses.
+
+    Args:
+        server (ServiceSimServer): The server to talk to.
+
+    Returns:
+        list: The (speaker, text) history of the conversation.
+    """
+    session, _ = server.open_session()
+    messages = [
+        random.choice([
+            "Hi, I just wanted to check on my order status. Everything has been great so far!",
+            "Hi, I haven't received my order yet and I'm getting frustrated."
+        ]),
+        f"Sure, the order number is {random.randint(1000, 9999)}.",
+        random.choice(["I ordered the GizmoTron.", "I ordered the Thingamajig."]),
+        "When will my order be shipped?",
+        "Thank you!",
+    ]
+    for message in messages:
+        await server.handle_message(session.session_id, message)
+    server.close_session(session.session_id)
+    return session.history
+
+async def run_simulation(bot, num_sessions, max_batch_size=None, max_wait=0.01):
+    """
+    Runs many scripted conversations concurrently and reports throughput and batch sizes.
+
+    Args:
+        bot (CustomerServiceBot): The bot to serve the conversations.
+        num_sessions (int): The number of concurrent conversations.
+        max_batch_size (int): The scheduler's maximum batch size.
+        max_wait (float): The scheduler's batching deadline in seconds.
+
+    Returns:
+        dict: Elapsed seconds, conversations per second and mean batch size per task.
+    """
+    scheduler = MicroBatchScheduler(bot, max_batch_size, max_wait)
+    scheduler.start()
+    server = ServiceSimServer(bot, scheduler)
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(simulate_conversation(server) for _ in range(num_sessions)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await scheduler.stop()
+
+    mean_batch_sizes = {task: sum(sizes) / len(sizes) for task, sizes in scheduler.batch_sizes.items() if sizes}
+    print(f"{num_sessions} conversations in {elapsed:.2f}s ({num_sessions / elapsed:.1f} conversations/s)")
+    for task, size in mean_batch_sizes.items():
+        print(f"  {task:<14}{len(scheduler.batch_sizes[task]):>6} batches, mean size {size:.1f}")
+    return {"elapsed_time": elapsed, "conversations_per_second": num_sessions / elapsed, "mean_batch_sizes": mean_batch_sizes}
+
+async def serve(bot, host, port, max_batch_size=None, max_wait=0.01):
+    """
+    Serves customer conversations over TCP until cancelled.
+
+    Args:
+        bot (CustomerServiceBot): The bot to serve the conversations.
+        host (str): The interface to listen on.
+        port (int): The port to listen on.
+        max_batch_size (int): The scheduler's maximum batch size.
+        max_wait (float): The scheduler's batching deadline in seconds.
+    """
+    scheduler = MicroBatchScheduler(bot, max_batch_size, max_wait)
+    scheduler.start()
+    server = ServiceSimServer(bot, scheduler)
+    tcp_server = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"Serving on {host}:{port}")
+    try:
+        async with tcp_server:
+            await tcp_server.serve_forever()
+    finally:
+        await scheduler.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve concurrent ServiceSim conversations with micro-batched model inference.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=32, help="Maximum requests per model batch.")
+    parser.add_argument("--max-wait-ms", type=float, default=10.0, help="Longest time a request waits for its batch to fill.")
+    parser.add_argument("--multitask-model", default=None, help="Directory of a distilled shared-encoder classifier.")
+    parser.add_argument("--backend", choices=INFERENCE_BACKENDS, default="torch", help="Inference backend for the models.")
+    parser.add_argument("--onnx-model-dir", default=DEFAULT_ONNX_MODEL_DIR, help="Directory of the graphs exported by ExportModels.py.")
+    parser.add_argument("--simulate", type=int, default=0, metavar="N", help="Run N scripted conversations concurrently instead of serving.")
+    args = parser.parse_args()
+
+    try:
+        bot = CustomerServiceBot(max_batch_size=args.max_batch_size, warm_up=True, multitask_model_path=args.multitask_model,
+                                 headless=True, inference_backend=args.backend, onnx_model_dir=args.onnx_model_dir)
+        if args.simulate:
+            asyncio.run(run_simulation(bot, args.simulate, args.max_batch_size, args.max_wait_ms / 1000))
+        else:
+            asyncio.run(serve(bot, args.host, args.port, args.max_batch_size, args.max_wait_ms / 1000))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+    except Exception as e:
+        print(f"Server failed: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
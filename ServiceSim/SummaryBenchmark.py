@@ -0,0 +1,200 @@
+import argparse
+import json
+import re
+import sys
+import time
+import traceback
+
+import torch
+
+from ServiceSim import CustomerServiceBot, DEFAULT_ONNX_MODEL_DIR, INFERENCE_BACKENDS, SUMMARY_STRATEGIES
+
+def _tokens(text):
+    """Splits a text into lowercase word tokens for ROUGE."""
+    return re.findall(r"\w+", text.lower())
+
+def _f1(overlap, candidate_count, reference_count):
+    """Returns the F1 score of an overlap count."""
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate_count, overlap / reference_count
+    return 2 * precision * recall / (precision + recall)
+
+def rouge_n(candidate, reference, n):
+    """
+    Computes the ROUGE-N F1 score of a candidate summary against a reference.
+
+    Args:
+        candidate (str): The generated summary.
+        reference (str): The reference summary.
+        n (int): The n-gram order.
+
+    Returns:
+        float: The F1 score of the clipped n-gram overlap.
+    """
+    def ngrams(tokens):
+        counts = {}
+        for i in range(len(tokens) - n + 1):
+            gram = tuple(tokens[i:i + n])
+            counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    candidate_grams, reference_grams = ngrams(_tokens(candidate)), ngrams(_tokens(reference))
+    overlap = sum(min(count, reference_grams.get(gram, 0)) for gram, count in candidate_grams.items())
+    return _f1(overlap, sum(candidate_grams.values()), sum(reference_grams.values()))
+
+def rouge_l(candidate, reference):
+    """
+    Computes the ROUGE-L F1 score, based on the longest common subsequence of tokens.
+
+    Args:
+        candidate (str): The generated summary.
+        reference (str): The reference summary.
+
+    Returns:
+        float: The F1 score of the longest common subsequence.
+    """
+    candidate_tokens, reference_tokens = _tokens(candidate), _tokens(reference)
+    previous = [0] * (len(reference_tokens) + 1)
+    for token in candidate_tokens:
+        current = [0]
+        for j, reference_token in enumerate(reference_tokens):
+            current.append(previous[j] + 1 if token == reference_token else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(candidate_tokens), len(reference_tokens))
+
+def benchmark_strategy(bot, texts, strategy, cache_encoder_outputs, repeats):
+    """
+    Times a decoding strategy over the given texts, summarizing each text repeatedly.
+
+    The encoder-output cache is cleared first, so the first summarization of each text pays for the
+    encoder and the repeats show the benefit of reusing it.
+
+    Args:
+        bot (CustomerServiceBot): The bot whose summarizer is benchmarked.
+        texts (list): The texts to summarize.
+        strategy (str): A key of SUMMARY_STRATEGIES.
+        cache_encoder_outputs (bool): Whether to reuse encoder outputs across repeats.
+        repeats (int): The number of summarizations per text.
+
+    Returns:
+        tuple: The summaries (one per text) and the mean latency in milliseconds.
+    """
+    bot.cache_encoder_outputs = cache_encoder_outputs
+    bot._encoder_cache.clear()
+    params = {**bot.shipping_summary_params, **SUMMARY_STRATEGIES[strategy]}
+    summaries, latencies = [], []
+    for text in texts:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            summary = bot.summarize_text(text, **params)
+            latencies.append(time.perf_counter() - start)
+        summaries.append(summary)
+    return summaries, 1000 * sum(latencies) / len(latencies)
+
+def benchmark_streaming(bot, texts, repeats):
+    """
+    Times streaming summarization, measuring both the first piece and the full summary.
+
+    Args:
+        bot (CustomerServiceBot): The bot whose summarizer is benchmarked.
+        texts (list): The texts to summarize.
+        repeats (int): The number of summarizations per text.
+
+    Returns:
+        tuple: The summaries, the mean time to the first piece and the mean total time, in milliseconds.
+    """
+    bot.cache_encoder_outputs = False
+    params = bot.shipping_summary_params
+    summaries, first_latencies, latencies = [], [], []
+    for text in texts:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            chunks = []
+            for chunk in bot.stream_summary(text, max_length=params["max_length"], min_length=params["min_length"]):
+                if not chunks:
+                    first_latencies.append(time.perf_counter() - start)
+                chunks.append(chunk)
+            latencies.append(time.perf_counter() - start)
+        summaries.append(bot._format_summary("".join(chunks)))
+    return summaries, 1000 * sum(first_latencies) / len(first_latencies), 1000 * sum(latencies) / len(latencies)
+
+def score(summaries, references):
+    """Returns the mean ROUGE-1, ROUGE-2 and ROUGE-L F1 scores of summaries against references."""
+    count = len(summaries)
+    return {
+        "rouge1": sum(rouge_n(s, r, 1) for s, r in zip(summaries, references)) / count,
+        "rouge2": sum(rouge_n(s, r, 2) for s, r in zip(summaries, references)) / count,
+        "rougeL": sum(rouge_l(s, r) for s, r in zip(summaries, references)) / count,
+    }
+
+def run_benchmark(bot, repeats=3, references=None):
+    """
+    Compares the latency and ROUGE scores of all summarization strategies on the shipping texts.
+
+    Args:
+        bot (CustomerServiceBot): The bot whose summarizer is benchmarked.
+        repeats (int): The number of summarizations per text and strategy.
+        references (dict): Optional human reference summary per product. Without them, the
+                           current production output (4-beam search) serves as the reference.
+
+    Returns:
+        list: One result dict per configuration.
+    """
+    products = list(bot.shipping_info.keys())
+    texts = [bot.shipping_info[product] for product in products]
+    bot.summarize_text(texts[0], **bot.shipping_summary_params)
+
+    results = []
+    baseline = None
+    for strategy in SUMMARY_STRATEGIES:
+        for cache_encoder_outputs in ((False, True) if bot.inference_backend != "onnx" else (False,)):
+            summaries, mean_ms = benchmark_strategy(bot, texts, strategy, cache_encoder_outputs, repeats)
+            baseline = baseline or summaries
+            results.append({"strategy": strategy, "encoder_cache": cache_encoder_outputs, "mean_ms": mean_ms,
+                            "first_piece_ms": mean_ms, "summaries": summaries})
+
+    summaries, first_ms, mean_ms = benchmark_streaming(bot, texts, repeats)
+    results.append({"strategy": "greedy-stream", "encoder_cache": False, "mean_ms": mean_ms, "first_piece_ms": first_ms, "summaries": summaries})
+
+    reference_summaries = [references[product] for product in products] if references else baseline
+    for result in results:
+        result.update(score(result["summaries"], reference_summaries))
+    return results
+
+def print_benchmark(results, reference_name):
+    """Prints the latency against ROUGE comparison as a table."""
+    print(f"\nROUGE F1 against {reference_name}")
+    print(f"{'Strategy':<16}{'Enc. cache':>11}{'Mean ms':>10}{'First ms':>10}{'ROUGE-1':>9}{'ROUGE-2':>9}{'ROUGE-L':>9}")
+    for r in results:
+        print(f"{r['strategy']:<16}{'yes' if r['encoder_cache'] else 'no':>11}{r['mean_ms']:>10.1f}{r['first_piece_ms']:>10.1f}"
+              f"{r['rouge1']:>9.3f}{r['rouge2']:>9.3f}{r['rougeL']:>9.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark summarization strategies on the shipping texts: latency against ROUGE.")
+    parser.add_argument("--repeats", type=int, default=3, help="Summarizations per text and strategy.")
+    parser.add_argument("--references", default=None, help="Optional JSON file mapping product names to reference summaries.")
+    parser.add_argument("--backend", choices=INFERENCE_BACKENDS, default="torch", help="Inference backend for the summarizer.")
+    parser.add_argument("--onnx-model-dir", default=DEFAULT_ONNX_MODEL_DIR)
+    parser.add_argument("--report", default=None, help="Optional JSON file for the results.")
+    args = parser.parse_args()
+
+    try:
+        torch.set_grad_enabled(False)
+        references = None
+        if args.references:
+            with open(args.references, "r", encoding="utf-8") as f:
+                references = json.load(f)
+        bot = CustomerServiceBot(summary_cache_path=None, headless=True, inference_backend=args.backend, onnx_model_dir=args.onnx_model_dir)
+        results = run_benchmark(bot, args.repeats, references)
+        print_benchmark(results, "the reference summaries" if references else "4-beam search (the current default)")
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+    except Exception as e:
+        print(f"Benchmark failed: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,18 @@
 import numpy as np
-import cupy as cp
-from cupyx.scipy.sparse import csr_matrix
-from cupyx.scipy.sparse.linalg import eigsh
+import scipy.sparse
+import scipy.sparse.linalg
+from scipy.sparse.csgraph import reverse_cuthill_mckee
 from scipy.spatial import Delaunay, cKDTree
+from types import SimpleNamespace
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import multiprocessing
+import cProfile
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import time
 import json
 import sys
@@ -10,18 +20,237 @@ import traceback
 import matplotlib.pyplot as plt
 import warnings
 
+try:
+    import resource
+except ImportError:
+    resource = None
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
-def generate_mesh(N, boundary_type='smooth', dimension=3):
+# Bump whenever mesh generation or assembly changes, so cached operators are not reused
+CODE_VERSION = "3"
+
+def get_backend(name='auto'):
+    """
+    Select the array backend for the pipeline: 'numpy' (NumPy/SciPy), 'cupy' (CuPy/cupyx),
+    or 'auto' to use CuPy when it is available and fall back to NumPy otherwise.
+    An already selected backend is returned unchanged.
+    """
+    if isinstance(name, SimpleNamespace):
+        return name
+    if name not in ('auto', 'numpy', 'cupy'):
+        raise ValueError(f"Unknown backend '{name}'. Expected 'auto', 'numpy' or 'cupy'.")
+    if name in ('auto', 'cupy'):
+        try:
+            import cupy as cp
+            import cupyx.scipy.sparse
+            import cupyx.scipy.sparse.linalg
+            cp.cuda.runtime.getDeviceCount()
+            return SimpleNamespace(name='cupy', xp=cp, sparse=cupyx.scipy.sparse,
+                                   linalg=cupyx.scipy.sparse.linalg, asnumpy=cp.asnumpy)
+        except Exception:
+            if name == 'cupy':
+                raise
+    return SimpleNamespace(name='numpy', xp=np, sparse=scipy.sparse,
+                           linalg=scipy.sparse.linalg, asnumpy=np.asarray)
+
+class StageProfiler:
+    """
+    Record wall time, peak RSS and array sizes for each stage of a simulation.
+
+    Where the kernel's RSS high-water mark can be reset (Linux), it is reset at the start of every stage,
+    so peak_rss_mb is the stage's own peak. Elsewhere only the lifetime peak is available, and the stage
+    records peak_rss_growth_mb, the amount by which it raised that peak.
+    """
+
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        record = {"stage": name}
+        peak_reset = reset_peak_rss()
+        peak_before = None if peak_reset else peak_rss_megabytes()
+        start_time = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["wall_time"] = time.perf_counter() - start_time
+            peak_rss = peak_rss_megabytes()
+            if peak_reset:
+                record["peak_rss_mb"] = peak_rss
+            else:
+                record["peak_rss_growth_mb"] = peak_rss - peak_before if peak_rss is not None else None
+            self.stages.append(record)
+
+    def report(self):
+        header = 'Peak RSS (MB)' if all('peak_rss_mb' in record for record in self.stages) else 'RSS growth (MB)'
+        print(f"\n{'Stage':<22}{'Time (s)':>12}{header:>16}")
+        for record in self.stages:
+            peak_rss = record.get("peak_rss_mb", record.get("peak_rss_growth_mb"))
+            peak_rss = f"{peak_rss:.1f}" if peak_rss is not None else "n/a"
+            print(f"{record['stage']:<22}{record['wall_time']:>12.3f}{peak_rss:>16}")
+
+def profile_stage(profiler, name):
+    """
+    Return a context manager that records a stage on the profiler, or a no-op one when profiling is off.
+    """
+    return profiler.stage(name) if profiler is not None else nullcontext({})
+
+def reset_peak_rss():
+    """
+    Reset the process's RSS high-water mark (Linux only). Returns whether the reset succeeded.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_megabytes():
+    """
+    Return the peak resident set size in MB since the last reset_peak_rss (VmHWM on Linux), falling back
+    to the lifetime peak from getrusage, or None where neither is available.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    return peak_rss / 1e6 if sys.platform == 'darwin' else peak_rss / 1e3
+
+def array_megabytes(*arrays):
+    """
+    Return the total size in MB of dense or sparse arrays.
+    """
+    total = 0
+    for array in arrays:
+        if hasattr(array, 'indptr'):
+            total += array.data.nbytes + array.indices.nbytes + array.indptr.nbytes
+        else:
+            total += array.nbytes
+    return total / 1e6
+
+def generate_mesh(N, boundary_type='smooth', dimension=3, backend='auto', boundary_layer=0, seed=None,
+                  profiler=None, min_quality=0.0, chunk_size=2**18):
     """
     Generate a 3D mesh for the finite element method, with adaptive refinement near singularities.
+    If boundary_layer > 0, a structured grid with that many points per edge is added on the cube faces.
+    The random points are drawn from a generator seeded with seed, so meshes are reproducible.
+    Elements with a face on the convex hull are dropped if they are nearly flat or their radius ratio is
+    below min_quality. Interior slivers are only counted: dropping them would leave holes whose faces
+    topological boundary detection treats as Dirichlet boundary. The quality pass runs in chunks of chunk_size.
     """
     try:
-        print(f"Generating {dimension}D mesh with {N} points for {boundary_type} boundary.")
-        points = np.random.rand(N, dimension).astype(np.float64)
+        backend = get_backend(backend)
+        xp = backend.xp
+        with profile_stage(profiler, 'mesh_generation') as stage:
+            print(f"Generating {dimension}D mesh with {N} points for {boundary_type} boundary.")
+            points = np.random.default_rng(seed).random((N, dimension), dtype=np.float64)
+            if boundary_layer > 0:
+                layer = generate_boundary_layer(boundary_layer, dimension)
+                print(f"Adding a structured boundary layer of {len(layer)} points.")
+                points = np.vstack((points, layer))
+
+            # Refine the mesh depending on the singularity type
+            if boundary_type == 'edge':
+                print("Applying edge refinement to the mesh (3D).")
+                points[:, 0] *= 0.5  # Compress along x-axis near x=0
+            elif boundary_type == 'cusp':
+                print("Applying cusp refinement to the mesh (3D).")
+                points[:, 2] = points[:, 2] ** 2  # Concentrate points near z=0
+            elif boundary_type == 'conical':
+                print("Applying conical refinement to the mesh (3D).")
+                r = np.linalg.norm(points, axis=1)
+                theta = np.arccos(np.divide(points[:, 2], r, out=np.ones_like(r), where=r > 0))
+                phi = np.arctan2(points[:, 1], points[:, 0])
+                r = r ** 0.5  # Adjust radial distance
+                points[:, 0] = r * np.sin(theta) * np.cos(phi)
+                points[:, 1] = r * np.sin(theta) * np.sin(phi)
+                points[:, 2] = r * np.cos(theta)
+
+            # Ensure points remain within the unit cube after transformation
+            points = np.clip(points, 0.0, 1.0)
+            stage["num_points"] = len(points)
+
+        # Remove duplicate or too-close points
+        with profile_stage(profiler, 'close_point_removal') as stage:
+            points = remove_close_points(points)
+            stage["num_points"] = len(points)
+
+        # Create Delaunay triangulation in 3D
+        with profile_stage(profiler, 'delaunay') as stage:
+            tri = Delaunay(points)
+            elements = tri.simplices  # Tetrahedra with 4 nodes
+            stage["num_elements"] = len(elements)
+
+        # Compute volume, radius ratio and dihedral angles chunk by chunk, and drop small or sliver elements
+        # on the hull; interior ones are kept, since removing them would punch holes into the domain
+        with profile_stage(profiler, 'quality_filtering') as stage:
+            min_volume_threshold = 1e-12  # Adjusted threshold for 3D
+            on_hull = (tri.neighbors == -1).any(axis=1)
+            keep = np.ones(len(elements), dtype=bool)
+            num_interior_slivers = 0
+            min_radius_ratio, radius_ratio_sum, min_dihedral = np.inf, 0.0, np.inf
+            chunk_size = chunk_size or len(elements)
+            for start in range(0, len(elements), chunk_size):
+                quality, _ = compute_mesh_quality(points, elements[start:start + chunk_size], backend='numpy')
+                bad = (quality["volumes"] <= min_volume_threshold) | (quality["radius_ratio"] < min_quality)
+                chunk_on_hull = on_hull[start:start + chunk_size]
+                chunk_keep = ~(bad & chunk_on_hull)
+                keep[start:start + chunk_size] = chunk_keep
+                num_interior_slivers += int((bad & ~chunk_on_hull).sum())
+                if chunk_keep.any():
+                    min_radius_ratio = min(min_radius_ratio, float(quality["radius_ratio"][chunk_keep].min()))
+                    radius_ratio_sum += float(quality["radius_ratio"][chunk_keep].sum())
+                    min_dihedral = min(min_dihedral, float(quality["min_dihedral"][chunk_keep].min()))
+                del quality
+            elements = elements[keep]
+            stage["num_elements"] = len(elements)
+            stage["num_dropped"] = int((~keep).sum())
+            stage["num_interior_slivers"] = num_interior_slivers
+            if len(elements):
+                stage["min_radius_ratio"] = min_radius_ratio
+                stage["mean_radius_ratio"] = radius_ratio_sum / len(elements)
+                stage["min_dihedral_deg"] = min_dihedral
+            stage["array_mb"] = array_megabytes(points, elements)
+        print(f"Dropped {int((~keep).sum())} hull elements below the volume or quality threshold; "
+              f"kept {num_interior_slivers} interior ones.")
+
+        print(f"Generated mesh with {len(points)} nodes and {len(elements)} elements.")
+        return xp.asarray(points, dtype=xp.float64), xp.asarray(elements, dtype=xp.int32)
+    except Exception as e:
+        print(f"Error during mesh generation: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+def generate_structured_mesh(N, boundary_type='smooth', dimension=3, backend='auto'):
+    """
+    Generate a structured 3D mesh with about N nodes: a tensor grid whose cubes are each split into
+    6 tetrahedra (Kuhn subdivision), warped to mimic the refinement of generate_mesh.
+    The mesh is built entirely by index arithmetic and has no degenerate elements.
+    """
+    try:
+        backend = get_backend(backend)
+        xp = backend.xp
+        if dimension != 3:
+            raise ValueError("The structured mesh generator only supports 3D meshes.")
+        n = max(2, int(round(N ** (1.0 / 3.0))))
+        print(f"Generating structured {dimension}D mesh with {n}^3 = {n ** 3} points for {boundary_type} boundary.")
+
+        # Node (i, j, k) has index i + j*n + k*n^2 and coordinates (i, j, k) / (n - 1)
+        grid = np.arange(n, dtype=np.float64) / (n - 1)
+        z, y, x = np.meshgrid(grid, grid, grid, indexing='ij')
+        points = np.stack((x.ravel(), y.ravel(), z.ravel()), axis=1)
 
-        # Refine the mesh depending on the singularity type
         if boundary_type == 'edge':
             print("Applying edge refinement to the mesh (3D).")
             points[:, 0] *= 0.5  # Compress along x-axis near x=0
@@ -30,34 +259,109 @@ def generate_mesh(N, boundary_type='smooth', dimension=3):
             points[:, 2] = points[:, 2] ** 2  # Concentrate points near z=0
         elif boundary_type == 'conical':
             print("Applying conical refinement to the mesh (3D).")
-            r = np.linalg.norm(points, axis=1)
-            theta = np.arccos(points[:, 2] / r)
-            phi = np.arctan2(points[:, 1], points[:, 0])
-            r = r ** 0.5  # Adjust radial distance
-            points[:, 0] = r * np.sin(theta) * np.cos(phi)
-            points[:, 1] = r * np.sin(theta) * np.sin(phi)
-            points[:, 2] = r * np.cos(theta)
+            # Radial map s -> s^0.5 along rays from the origin, using the max-norm so the cube maps onto itself
+            s = points.max(axis=1)
+            scale = np.divide(1.0, np.sqrt(s), out=np.zeros_like(s), where=s > 0)
+            points *= scale[:, None]
 
-        # Ensure points remain within the unit cube after transformation
-        points = np.clip(points, 0.0, 1.0)
+        # Lowest corner of every cube, and the index offsets of the 8 cube corners
+        cube = np.arange(n - 1)
+        ck, cj, ci = np.meshgrid(cube, cube, cube, indexing='ij')
+        base = (ci + cj * n + ck * n * n).ravel()
+        step = np.array([1, n, n * n])
 
-        # Remove duplicate or too-close points
-        points = remove_close_points(points)
+        # Kuhn subdivision: one tetrahedron per axis permutation, walking from corner (0,0,0) to (1,1,1)
+        permutations = [(0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0), (2, 0, 1), (2, 1, 0)]
+        offsets = np.array([[0, step[p[0]], step[p[0]] + step[p[1]], step.sum()] for p in permutations])
+        elements = (base[:, None, None] + offsets[None, :, :]).reshape(-1, 4)
 
-        # Create Delaunay triangulation in 3D
-        tri = Delaunay(points)
-        elements = tri.simplices  # Tetrahedra with 4 nodes
+        print(f"Generated mesh with {len(points)} nodes and {len(elements)} elements.")
+        return xp.asarray(points, dtype=xp.float64), xp.asarray(elements, dtype=xp.int32)
+    except Exception as e:
+        print(f"Error during structured mesh generation: {e}")
+        traceback.print_exc()
+        sys.exit(1)
 
-        # Compute and filter elements with small volumes
-        volumes = compute_element_volumes(points, elements)
-        min_volume_threshold = 1e-12  # Adjusted threshold for 3D
-        valid_elements = elements[volumes > min_volume_threshold]
-        elements = valid_elements
+def generate_boundary_layer(points_per_edge, dimension=3):
+    """
+    Generate a structured grid of points on the faces of the unit cube.
+    """
+    grid_1d = np.linspace(0.0, 1.0, points_per_edge)
+    face_grid = np.stack(np.meshgrid(*([grid_1d] * (dimension - 1)), indexing='ij'), axis=-1).reshape(-1, dimension - 1)
+    faces = []
+    for axis in range(dimension):
+        for value in (0.0, 1.0):
+            faces.append(np.insert(face_grid, axis, value, axis=1))
+    return np.unique(np.vstack(faces), axis=0)
 
-        print(f"Generated mesh with {len(points)} nodes and {len(elements)} elements.")
-        return cp.asarray(points, dtype=cp.float64), cp.asarray(elements, dtype=cp.int32)
+def compute_bandwidth(elements):
+    """
+    Compute the bandwidth (largest |i - j| over node pairs sharing an element) of the operator's sparsity pattern.
+    """
+    return int((elements.max(axis=1) - elements.min(axis=1)).max()) if len(elements) else 0
+
+def morton_order(points, bits=21):
+    """
+    Return the node order along a Morton (Z-order) space-filling curve.
+    """
+    span = np.maximum(points.max(axis=0) - points.min(axis=0), 1e-300)
+    quantized = ((points - points.min(axis=0)) / span * (2 ** bits - 1)).astype(np.uint64)
+
+    def spread_bits(v):
+        # Insert two zero bits between each of the lowest 21 bits of v
+        v &= np.uint64(0x1FFFFF)
+        v = (v | (v << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+        v = (v | (v << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+        v = (v | (v << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+        v = (v | (v << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+        v = (v | (v << np.uint64(2))) & np.uint64(0x1249249249249249)
+        return v
+
+    codes = np.zeros(len(points), dtype=np.uint64)
+    for axis in range(points.shape[1]):
+        codes |= spread_bits(quantized[:, axis].copy()) << np.uint64(axis)
+    return np.argsort(codes, kind='stable')
+
+def reorder_mesh(nodes, elements, method='rcm', backend='auto'):
+    """
+    Renumber nodes (and sort elements) to reduce the bandwidth of the assembled operator.
+
+    method='rcm' applies reverse Cuthill-McKee to the node adjacency graph of the elements,
+    method='morton' sorts nodes along a Morton space-filling curve.
+    Returns the reordered nodes and elements and a dict with the bandwidth before and after.
+    """
+    try:
+        backend = get_backend(backend)
+        xp = backend.xp
+        nodes_cpu = backend.asnumpy(nodes)
+        elements_cpu = backend.asnumpy(elements)
+        N = len(nodes_cpu)
+        bandwidth_before = compute_bandwidth(elements_cpu)
+
+        if method == 'rcm':
+            rows = np.repeat(elements_cpu, 4, axis=1).ravel()
+            cols = np.tile(elements_cpu, (1, 4)).ravel()
+            graph = scipy.sparse.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(N, N))
+            order = reverse_cuthill_mckee(graph, symmetric_mode=True)
+        elif method == 'morton':
+            order = morton_order(nodes_cpu)
+        else:
+            raise ValueError(f"Unknown reordering method '{method}'. Expected 'rcm' or 'morton'.")
+
+        # order[new] = old; renumber element connectivity with the inverse permutation
+        new_index = np.empty(N, dtype=np.int64)
+        new_index[order] = np.arange(N)
+        nodes_cpu = nodes_cpu[order]
+        elements_cpu = new_index[elements_cpu].astype(elements_cpu.dtype)
+        element_order = np.argsort(elements_cpu.min(axis=1), kind='stable')
+        elements_cpu = elements_cpu[element_order]
+
+        bandwidth_after = compute_bandwidth(elements_cpu)
+        print(f"Reordered nodes with {method}: bandwidth {bandwidth_before} -> {bandwidth_after}.")
+        reordering = {"method": method, "bandwidth_before": bandwidth_before, "bandwidth_after": bandwidth_after}
+        return xp.asarray(nodes_cpu, dtype=xp.float64), xp.asarray(elements_cpu, dtype=xp.int32), reordering
     except Exception as e:
-        print(f"Error during mesh generation: {e}")
+        print(f"Error during mesh reordering: {e}")
         traceback.print_exc()
         sys.exit(1)
 
@@ -80,99 +384,216 @@ def remove_close_points(points, min_distance=1e-5):
         traceback.print_exc()
         sys.exit(1)
 
-def compute_element_volumes(points, elements):
+def compute_element_geometry(nodes, elements, backend='auto'):
     """
-    Compute the volumes of tetrahedral elements.
+    Compute the volumes and shape-function gradients of all tetrahedral elements in one batched pass.
+    Degenerate elements get zero volume and zero gradients.
     """
     try:
-        coords = points[elements]
-        # Vectors along the edges
-        v0 = coords[:, 0, :]
-        v1 = coords[:, 1, :]
-        v2 = coords[:, 2, :]
-        v3 = coords[:, 3, :]
-
-        # Compute volume of tetrahedra
-        vol = np.abs(np.einsum('ij,ij->i', np.cross(v1 - v0, v2 - v0), v3 - v0)) / 6.0
-        return vol
+        backend = get_backend(backend)
+        xp = backend.xp
+        coords = nodes[elements]  # Shape: (E, 4, 3)
+
+        # Coefficient matrices [1, x, y, z] for every element, shape (E, 4, 4)
+        coeff_matrices = xp.concatenate((xp.ones(coords.shape[:2] + (1,), dtype=coords.dtype), coords), axis=2)
+        volumes = xp.abs(xp.linalg.det(coeff_matrices)) / 6.0
+
+        # Only invert non-degenerate elements to keep the batched inverse well defined
+        valid = volumes > 0
+        gradients = xp.zeros(coords.shape, dtype=coords.dtype)
+        # The gradients of the shape functions are given by the last three rows of the inverse matrix
+        gradients[valid] = xp.transpose(xp.linalg.inv(coeff_matrices[valid])[:, 1:, :], (0, 2, 1))
+        return {"volumes": volumes, "gradients": gradients}
     except Exception as e:
-        print(f"Error during computation of element volumes: {e}")
+        print(f"Error computing element geometry: {e}")
         traceback.print_exc()
         sys.exit(1)
 
-def compute_local_stiffness_matrix(nodes, element):
+def compute_mesh_quality(nodes, elements, geometry=None, backend='auto'):
     """
-    Calculate the local stiffness matrix for a tetrahedral element using linear shape functions.
+    Compute per-element quality measures of a tetrahedral mesh in a single vectorized sweep:
+    volume, radius ratio 3 r_in / R_circ (1 for a regular tetrahedron, 0 for a sliver) and the
+    minimum dihedral angle in degrees. Returns the measures together with the element geometry.
     """
     try:
-        # Extract node coordinates
-        element_indices = element.get()
-        coords = nodes.get()[element_indices, :]  # Shape: (4, 3)
-
-        # Compute volume of the tetrahedron
-        v0 = coords[0]
-        v1 = coords[1]
-        v2 = coords[2]
-        v3 = coords[3]
-        mat = np.array([
-            [1, v0[0], v0[1], v0[2]],
-            [1, v1[0], v1[1], v1[2]],
-            [1, v2[0], v2[1], v2[2]],
-            [1, v3[0], v3[1], v3[2]],
-        ])
-        volume = np.abs(np.linalg.det(mat)) / 6.0
-        if volume <= 0:
-            return np.zeros((4, 4))
-
-        # Compute the gradients of the shape functions
-        grads = np.zeros((4, 3))
-        coeff_matrix = np.hstack((np.ones((4, 1)), coords))
-        inv_coeff_matrix = np.linalg.inv(coeff_matrix)
+        backend = get_backend(backend)
+        xp = backend.xp
+        if geometry is None:
+            geometry = compute_element_geometry(nodes, elements, backend)
+        volumes = geometry["volumes"]
+        gradients = geometry["gradients"]
 
-        # The gradients of the shape functions are given by the last three rows of the inverse matrix
-        for i in range(4):
-            coeffs = inv_coeff_matrix[:, i]
-            grads[i, :] = coeffs[1:]  # Gradient components
-
-        # Compute the local stiffness matrix
-        stiffness = np.zeros((4, 4))
-        for i in range(4):
-            for j in range(4):
-                stiffness[i, j] = volume * np.dot(grads[i], grads[j])
-        return stiffness
+        # |grad phi_i| = area_i / (3 V), so the inradius r = 3 V / sum(area_i) = 1 / sum |grad phi_i|
+        gradient_norms = xp.linalg.norm(gradients, axis=2)
+        gradient_sum = gradient_norms.sum(axis=1)
+        inradius = xp.where(gradient_sum > 0, 1.0 / xp.where(gradient_sum > 0, gradient_sum, 1.0), 0.0)
+
+        # Circumradius R = |a^2 (b x c) + b^2 (c x a) + c^2 (a x b)| / (12 V) with edges a, b, c from vertex 0
+        coords = nodes[elements]
+        a, b, c = (coords[:, i, :] - coords[:, 0, :] for i in (1, 2, 3))
+        numerator = ((a * a).sum(axis=1)[:, None] * xp.cross(b, c) + (b * b).sum(axis=1)[:, None] * xp.cross(c, a)
+                     + (c * c).sum(axis=1)[:, None] * xp.cross(a, b))
+        circumradius_times_volume = xp.linalg.norm(numerator, axis=1) / 12.0
+        radius_ratio = xp.where(circumradius_times_volume > 0,
+                                3.0 * inradius * volumes / xp.where(circumradius_times_volume > 0,
+                                                                    circumradius_times_volume, 1.0), 0.0)
+
+        # Gradients are inward face normals; the dihedral angle between faces i and j is arccos(-n_i . n_j)
+        normals = gradients / xp.where(gradient_norms > 0, gradient_norms, 1.0)[:, :, None]
+        face_pairs = [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]
+        cosines = xp.stack([-(normals[:, i, :] * normals[:, j, :]).sum(axis=1) for i, j in face_pairs], axis=1)
+        min_dihedral = xp.degrees(xp.arccos(xp.clip(cosines, -1.0, 1.0))).min(axis=1)
+
+        quality = {"volumes": volumes, "radius_ratio": radius_ratio, "min_dihedral": min_dihedral}
+        return quality, geometry
     except Exception as e:
-        print(f"Error computing local stiffness matrix: {e}")
+        print(f"Error computing mesh quality: {e}")
         traceback.print_exc()
         sys.exit(1)
 
-def assemble_fem_laplacian(nodes, elements):
+def compute_local_stiffness_matrices(nodes, elements, backend='auto', geometry=None):
     """
-    Assemble the global stiffness matrix (Laplacian) using the finite element method.
+    Calculate the local stiffness matrices of all tetrahedral elements at once using linear shape functions.
+    Precomputed element geometry (see compute_element_geometry) is reused when given.
+    Returns the (E, 4, 4) stack of local matrices and the mask of non-degenerate elements.
     """
     try:
-        print(f"Assembling Laplacian for {len(nodes)} nodes and {len(elements)} elements.")
+        backend = get_backend(backend)
+        xp = backend.xp
+        if geometry is None:
+            geometry = compute_element_geometry(nodes, elements, backend)
+        valid = geometry["volumes"] > 0
+        volumes = geometry["volumes"][valid]
+        grads = geometry["gradients"][valid]  # Shape: (E, 4, 3)
+
+        # Compute the local stiffness matrices K_e = V_e * G_e G_e^T
+        stiffness = volumes[:, None, None] * xp.einsum('eik,ejk->eij', grads, grads)
+        return stiffness, valid
+    except Exception as e:
+        print(f"Error computing local stiffness matrices: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+def merge_spilled_partials(prefixes, N, spill_dir, entries_per_block):
+    """
+    Sum partial CSR matrices spilled to disk into a single CSR operator without loading them at once.
 
-        data = []
-        rows = []
-        cols = []
+    Rows are merged in blocks holding about entries_per_block partial entries: each block is read from
+    the memory-mapped partials, summed, and appended to data/indices files in spill_dir, which are then
+    memory-mapped as the arrays of the returned (host) CSR matrix. Peak memory is bounded by the block size.
+    """
+    partials = [{name: np.load(f"{prefix}_{name}.npy", mmap_mode='r') for name in ('data', 'indices', 'indptr')}
+                for prefix in prefixes]
+    total_entries = sum(len(partial['data']) for partial in partials)
+    num_blocks = max(1, -(-total_entries // max(1, entries_per_block)))
+    rows_per_block = max(1, -(-N // num_blocks))
+    # One index dtype for indices and indptr, so csr_matrix adopts the memory maps instead of copying them
+    index_dtype = np.int32 if max(total_entries, N) < 2**31 else np.int64
 
-        for idx, element in enumerate(elements):
-            local_stiffness = compute_local_stiffness_matrix(nodes, element)
-            if local_stiffness is None or np.all(local_stiffness == 0):
-                continue
+    indptr = np.zeros(N + 1, dtype=index_dtype)
+    nnz = 0
+    files = {name: tempfile.NamedTemporaryFile(dir=spill_dir, prefix=f"operator_{name}_", suffix='.bin', delete=False)
+             for name in ('data', 'indices')}
+    with files['data'], files['indices']:
+        for row_start in range(0, N, rows_per_block):
+            row_end = min(N, row_start + rows_per_block)
+            rows, cols, data = [], [], []
+            for partial in partials:
+                lo, hi = int(partial['indptr'][row_start]), int(partial['indptr'][row_end])
+                rows.append(np.repeat(np.arange(row_end - row_start), np.diff(partial['indptr'][row_start:row_end + 1])))
+                cols.append(np.asarray(partial['indices'][lo:hi]))
+                data.append(np.asarray(partial['data'][lo:hi]))
+            block = scipy.sparse.csr_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+                                            shape=(row_end - row_start, N))
+            files['data'].write(block.data.astype(np.float64).tobytes())
+            files['indices'].write(block.indices.astype(index_dtype).tobytes())
+            indptr[row_start + 1:row_end + 1] = nnz + block.indptr[1:]
+            nnz += block.nnz
+    del partials
+    if nnz == 0:
+        for spill_file in files.values():
+            os.remove(spill_file.name)
+        return scipy.sparse.csr_matrix((N, N), dtype=np.float64)
 
-            for i_local, i_global in enumerate(element):
-                for j_local, j_global in enumerate(element):
-                    rows.append(int(i_global.get()))
-                    cols.append(int(j_global.get()))
-                    data.append(local_stiffness[i_local, j_local])
+    data = np.memmap(files['data'].name, dtype=np.float64, mode='r', shape=(nnz,))
+    indices = np.memmap(files['indices'].name, dtype=index_dtype, mode='r', shape=(nnz,))
+    for spill_file in files.values():
+        try:
+            # The mapping keeps the data alive on POSIX; elsewhere the file stays until the directory is cleaned
+            os.remove(spill_file.name)
+        except OSError:
+            pass
+    return scipy.sparse.csr_matrix((data, indices, indptr), shape=(N, N), copy=False)
 
-        rows_cu = cp.array(rows, dtype=cp.int32)
-        cols_cu = cp.array(cols, dtype=cp.int32)
-        data_cu = cp.array(data, dtype=cp.float64)
+def assemble_fem_laplacian(nodes, elements, backend='auto', chunk_size=2**18, spill_dir=None):
+    """
+    Assemble the global stiffness matrix (Laplacian) using the finite element method.
 
+    Elements are processed in chunks of chunk_size, each producing a partial CSR matrix. In memory, the
+    partials are summed pairwise in a binary tree, so each entry is merged O(log chunks) times and at most
+    O(log chunks) partial sums are alive at once.
+    With a spill_dir, partial matrices are written to disk instead and merged row block by row block into
+    a memory-mapped CSR operator (see merge_spilled_partials), so the assembled operator need not fit in RAM.
+    Element geometry is computed per chunk, so it never exists for the whole mesh at once.
+    """
+    try:
+        backend = get_backend(backend)
+        xp = backend.xp
         N = len(nodes)
-        L_sparse = csr_matrix((data_cu, (rows_cu, cols_cu)), shape=(N, N))
+        num_elements = len(elements)
+        chunk_size = chunk_size or num_elements
+        num_chunks = max(1, -(-num_elements // chunk_size))
+        print(f"Assembling Laplacian for {N} nodes and {num_elements} elements in {num_chunks} chunk(s).")
+
+        # Stack of (partial sum, number of chunks it covers); equal-sized neighbours are merged eagerly
+        pending = []
+        spill_files = []
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        for chunk_index, start in enumerate(range(0, num_elements, chunk_size)):
+            chunk = elements[start:start + chunk_size]
+            local_stiffness, valid = compute_local_stiffness_matrices(nodes, chunk, backend)
+            chunk = chunk[valid]
+
+            # COO triplets: entry (i_local, j_local) of element e maps to (chunk[e, i], chunk[e, j])
+            rows = xp.broadcast_to(chunk[:, :, None], local_stiffness.shape).ravel()
+            cols = xp.broadcast_to(chunk[:, None, :], local_stiffness.shape).ravel()
+            data = local_stiffness.ravel()
+            partial = backend.sparse.csr_matrix((data, (rows, cols)), shape=(N, N))
+            del local_stiffness, rows, cols, data
+
+            if spill_dir is not None:
+                prefix = os.path.join(spill_dir, f"partial_{os.getpid()}_{chunk_index}")
+                for name in ('data', 'indices', 'indptr'):
+                    np.save(f"{prefix}_{name}.npy", backend.asnumpy(getattr(partial, name)))
+                spill_files.append(prefix)
+                del partial
+            else:
+                pending.append((partial, 1))
+                del partial
+                while len(pending) > 1 and pending[-1][1] == pending[-2][1]:
+                    (right, right_count), (left, left_count) = pending.pop(), pending.pop()
+                    pending.append((left + right, left_count + right_count))
+                    del left, right
+
+        if spill_files:
+            L_sparse = merge_spilled_partials(spill_files, N, spill_dir, 16 * chunk_size)
+            for prefix in spill_files:
+                for name in ('data', 'indices', 'indptr'):
+                    os.remove(f"{prefix}_{name}.npy")
+            if backend.name != 'numpy':
+                L_sparse = backend.sparse.csr_matrix(
+                    (xp.asarray(L_sparse.data), xp.asarray(L_sparse.indices), xp.asarray(L_sparse.indptr)),
+                    shape=(N, N))
+        elif pending:
+            while len(pending) > 1:
+                (right, _), (left, _) = pending.pop(), pending.pop()
+                pending.append((left + right, 0))
+                del left, right
+            L_sparse = pending.pop()[0]
+        else:
+            L_sparse = backend.sparse.csr_matrix((N, N), dtype=xp.float64)
 
         print(f"Laplacian matrix assembled in sparse format. Shape: {L_sparse.shape}")
         return L_sparse
@@ -181,16 +602,39 @@ def assemble_fem_laplacian(nodes, elements):
         traceback.print_exc()
         sys.exit(1)
 
-def identify_boundary_nodes(nodes):
+def identify_boundary_nodes(nodes, elements=None, backend='auto', method='topological'):
     """
-    Identify boundary nodes for a 3D unit cube domain.
+    Identify boundary nodes of the mesh.
+
+    method='topological' collects the nodes of faces owned by a single tetrahedron, which are the
+    hull facets of the (filtered) triangulation. method='box' selects nodes lying on the unit-cube faces.
     """
     try:
+        backend = get_backend(backend)
+        xp = backend.xp
+        if method == 'topological':
+            if elements is None:
+                raise ValueError("Topological boundary detection requires the mesh elements.")
+            # All 4 faces of every tetrahedron with sorted node indices, shape (4E, 3)
+            faces = elements[:, xp.asarray([[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]])].reshape(-1, 3)
+            faces = xp.sort(faces, axis=1)
+            faces = faces[xp.lexsort(faces.T[::-1])]
+
+            # Interior faces appear exactly twice in sorted order; boundary faces appear once
+            same_as_next = xp.all(faces[1:] == faces[:-1], axis=1)
+            single_owner = xp.ones(len(faces), dtype=bool)
+            single_owner[1:] &= ~same_as_next
+            single_owner[:-1] &= ~same_as_next
+            boundary_nodes = xp.unique(faces[single_owner])
+            return boundary_nodes
+        if method != 'box':
+            raise ValueError(f"Unknown boundary detection method '{method}'. Expected 'topological' or 'box'.")
+
         tol = 1e-5
-        boundary_nodes = cp.where(
-            (cp.abs(nodes[:, 0]) < tol) | (cp.abs(nodes[:, 0] - 1) < tol) |
-            (cp.abs(nodes[:, 1]) < tol) | (cp.abs(nodes[:, 1] - 1) < tol) |
-            (cp.abs(nodes[:, 2]) < tol) | (cp.abs(nodes[:, 2] - 1) < tol)
+        boundary_nodes = xp.where(
+            (xp.abs(nodes[:, 0]) < tol) | (xp.abs(nodes[:, 0] - 1) < tol) |
+            (xp.abs(nodes[:, 1]) < tol) | (xp.abs(nodes[:, 1] - 1) < tol) |
+            (xp.abs(nodes[:, 2]) < tol) | (xp.abs(nodes[:, 2] - 1) < tol)
         )[0]
         return boundary_nodes
     except Exception as e:
@@ -198,77 +642,434 @@ def identify_boundary_nodes(nodes):
         traceback.print_exc()
         sys.exit(1)
 
-def apply_dirichlet_boundary_conditions(L_sparse, nodes):
+def apply_dirichlet_boundary_conditions(L_sparse, nodes, elements=None, backend='auto', mode='identity',
+                                        boundary_method='topological'):
     """
     Apply zero Dirichlet boundary conditions to the global stiffness matrix.
+
+    mode='identity' keeps the full system and replaces boundary rows and columns by the identity,
+    mode='reduced' eliminates the boundary DOFs and returns the interior-only system.
+    Returns the constrained matrix and the node indices of its rows.
     """
     try:
-        boundary_nodes = identify_boundary_nodes(nodes)
+        backend = get_backend(backend)
+        xp = backend.xp
+        boundary_nodes = identify_boundary_nodes(nodes, elements, backend, boundary_method)
         print(f"Number of boundary nodes: {len(boundary_nodes)}")
 
-        L_sparse_cpu = L_sparse.get().tolil()
+        N = L_sparse.shape[0]
+        interior_mask = xp.ones(N, dtype=bool)
+        interior_mask[boundary_nodes] = False
+        L_sparse = L_sparse.tocsr()
 
-        for node in boundary_nodes.get():
-            L_sparse_cpu.rows[node] = [node]
-            L_sparse_cpu.data[node] = [1.0]
-            L_sparse_cpu[node, :] = 0
-            L_sparse_cpu[:, node] = 0
-            L_sparse_cpu[node, node] = 1.0
+        if mode == 'identity':
+            # D L D + (I - D) with D = diag(interior mask) zeroes boundary rows/columns in one pass
+            D = backend.sparse.diags(interior_mask.astype(L_sparse.dtype), format='csr')
+            I_boundary = backend.sparse.diags((~interior_mask).astype(L_sparse.dtype), format='csr')
+            L_sparse_bc = (D @ L_sparse @ D + I_boundary).tocsr()
+            L_sparse_bc.eliminate_zeros()
+            free_nodes = xp.arange(N, dtype=xp.int32)
+        elif mode == 'reduced':
+            # Restrict to the interior DOFs with a selection matrix P: L_int = P^T L P
+            free_nodes = xp.flatnonzero(interior_mask).astype(xp.int32)
+            num_free = len(free_nodes)
+            P = backend.sparse.csr_matrix(
+                (xp.ones(num_free, dtype=L_sparse.dtype), (free_nodes, xp.arange(num_free, dtype=xp.int32))),
+                shape=(N, num_free))
+            L_sparse_bc = (P.T @ L_sparse @ P).tocsr()
+            print(f"Reduced system to {num_free} interior DOFs.")
+        else:
+            raise ValueError(f"Unknown boundary condition mode '{mode}'. Expected 'identity' or 'reduced'.")
 
-        L_sparse_cpu = L_sparse_cpu.tocsr()
-        L_sparse_bc = csr_matrix(L_sparse_cpu)
-
-        return L_sparse_bc
+        return L_sparse_bc, free_nodes
     except Exception as e:
         print(f"Error applying Dirichlet boundary conditions: {e}")
         traceback.print_exc()
         sys.exit(1)
 
-def compute_eigenvalues(L_sparse, num_eigenvalues=100):
+def build_preconditioner(L_sparse, preconditioner='amg', backend='auto'):
+    """
+    Build a preconditioner for LOBPCG: 'amg' (smoothed aggregation multigrid via pyamg),
+    'ilu' (incomplete LU factorization), 'jacobi' (inverse diagonal) or 'none'.
+    Returns the preconditioner and the name of the one actually used.
+    """
+    backend = get_backend(backend)
+    if preconditioner == 'none':
+        return None, preconditioner
+    if preconditioner in ('amg', 'ilu') and backend.name != 'numpy':
+        print(f"The {preconditioner} preconditioner requires the numpy backend; using jacobi instead.")
+        preconditioner = 'jacobi'
+    if preconditioner == 'amg':
+        try:
+            import pyamg
+        except ImportError:
+            print("pyamg is not installed; using the jacobi preconditioner instead.")
+            preconditioner = 'jacobi'
+        else:
+            return pyamg.smoothed_aggregation_solver(L_sparse.tocsr()).aspreconditioner(cycle='V'), preconditioner
+    if preconditioner == 'ilu':
+        ilu = backend.linalg.spilu(L_sparse.tocsc(), drop_tol=1e-4, fill_factor=10)
+        return backend.linalg.LinearOperator(L_sparse.shape, matvec=ilu.solve, dtype=L_sparse.dtype), preconditioner
+    if preconditioner == 'jacobi':
+        inv_diagonal = 1.0 / L_sparse.diagonal()
+        return backend.sparse.diags(inv_diagonal, format='csr'), preconditioner
+    raise ValueError(f"Unknown preconditioner '{preconditioner}'. Expected 'amg', 'ilu', 'jacobi' or 'none'.")
+
+def compute_eigenvalues(L_sparse, num_eigenvalues=100, backend='auto', solver='lanczos', preconditioner='amg',
+                        sigma=None, profiler=None, initial_guess=None, precision='float64'):
     """
-    Compute the eigenvalues of the Laplacian using sparse eigsh solver on the GPU.
+    Compute the smallest non-zero eigenvalues of the Laplacian with the selected solver strategy:
+
+    'lanczos'       implicitly restarted Lanczos (eigsh, which='SA') on the operator itself,
+    'shift-invert'  Lanczos on (L - sigma I)^-1 using a sparse LU factorization,
+    'lobpcg'        preconditioned LOBPCG (see build_preconditioner).
+
+    Returns the eigenvalues, the matching eigenvectors and a dict with the iteration count,
+    matvec (or solve) count and wall time of the solve. SciPy's eigsh does not expose ARPACK's
+    iteration count, so iterations is None for the Lanczos solvers; compare them on matvecs.
+
+    initial_guess is an optional (n, m) block of approximate eigenvectors, e.g. interpolated from a coarser
+    mesh. LOBPCG uses it as the initial block; the Lanczos solvers start from the sum of its columns.
+
+    precision='mixed' runs the solve on a float32 copy of the operator values (sharing the index arrays)
+    and then refines the Ritz pairs by a float64 Rayleigh-Ritz projection onto the computed subspace.
+    During the solve the float64 values are parked in a temporary file, so only the float32 operator is
+    held in memory; callers should not keep their own reference to L_sparse for this to pay off.
     """
     try:
-        print(f"Computing {num_eigenvalues} smallest non-zero eigenvalues using sparse solver.")
+        backend = get_backend(backend)
+        xp = backend.xp
+        print(f"Computing {num_eigenvalues} smallest non-zero eigenvalues using the {solver} solver.")
+
+        with profile_stage(profiler, 'symmetrization') as stage:
+            L_sparse = (L_sparse + L_sparse.T) / 2
+            L_sparse = L_sparse.tocsr()
+            stage["array_mb"] = array_megabytes(L_sparse)
+        if precision == 'float64':
+            solve_matrix = L_sparse
+        elif precision == 'mixed':
+            if solver == 'lanczos':
+                print("Note: float32 Lanczos often stalls on the smallest eigenvalues; "
+                      "shift-invert or lobpcg are recommended with mixed precision.")
+            solve_matrix = backend.sparse.csr_matrix(
+                (L_sparse.data.astype(xp.float32), L_sparse.indices, L_sparse.indptr), shape=L_sparse.shape)
+            refinement_file = tempfile.TemporaryFile()
+            backend.asnumpy(L_sparse.data).tofile(refinement_file)
+            del L_sparse
+        else:
+            raise ValueError(f"Unknown precision '{precision}'. Expected 'float64' or 'mixed'.")
+        # float32 cannot resolve residuals much below 1e-6; the float64 refinement recovers the accuracy
+        tol = 1e-6 if precision == 'float64' else 1e-5
+        k = num_eigenvalues + 10
+        n = solve_matrix.shape[0]
+        solver_info = {"solver": solver, "precision": precision, "iterations": 0, "matvecs": 0,
+                       "warm_started": initial_guess is not None}
+        v0 = None
+        if initial_guess is not None:
+            initial_guess = initial_guess.astype(solve_matrix.dtype)
+            v0 = initial_guess.sum(axis=1)
+        start_time = time.time()
+        with profile_stage(profiler, 'eigensolve') as stage:
+            def matvec(x):
+                solver_info["matvecs"] += 1
+                return solve_matrix @ x
+
+            def matmat(X):
+                solver_info["matvecs"] += X.shape[1]
+                return solve_matrix @ X
+
+            operator = backend.linalg.LinearOperator(solve_matrix.shape, matvec=matvec, matmat=matmat,
+                                                     dtype=solve_matrix.dtype)
+
+            if solver == 'lanczos':
+                eigenvalues, eigenvectors = backend.linalg.eigsh(operator, k=k, which='SA', tol=tol, maxiter=5000,
+                                                                 v0=v0)
+                solver_info["iterations"] = None
+            elif solver == 'shift-invert':
+                if sigma is None:
+                    # Shift slightly below zero so the factorization stays definite even without boundary conditions
+                    sigma = -1e-8 * float(xp.abs(solve_matrix.diagonal()).max())
+                identity = backend.sparse.identity(n, dtype=solve_matrix.dtype, format='csr')
+                shifted = (solve_matrix - sigma * identity).tocsc()
+                factorization = backend.linalg.splu(shifted)
+                solver_info["factorization_time"] = time.time() - start_time
 
-        L_sparse = (L_sparse + L_sparse.T) / 2
+                def solve(x):
+                    solver_info["matvecs"] += 1
+                    return factorization.solve(x)
 
-        eigenvalues, _ = eigsh(L_sparse, k=num_eigenvalues + 10, which='SA', tol=1e-6, maxiter=5000)
+                inverse_operator = backend.linalg.LinearOperator(solve_matrix.shape, matvec=solve,
+                                                                 dtype=solve_matrix.dtype)
+                mu, eigenvectors = backend.linalg.eigsh(inverse_operator, k=k, which='LA', tol=tol, maxiter=5000,
+                                                        v0=v0)
+                eigenvalues = sigma + 1.0 / mu
+                solver_info["sigma"] = sigma
+                solver_info["iterations"] = None
+            elif solver == 'lobpcg':
+                M, preconditioner = build_preconditioner(solve_matrix, preconditioner, backend)
+                X = xp.asarray(np.random.default_rng(0).standard_normal((n, k)), dtype=solve_matrix.dtype)
+                if initial_guess is not None:
+                    num_guess = min(k, initial_guess.shape[1])
+                    X[:, :num_guess] = initial_guess[:, :num_guess]
+                eigenvalues, eigenvectors, residual_history = backend.linalg.lobpcg(
+                    operator, X, M=M, largest=False, tol=tol, maxiter=5000, retResidualNormsHistory=True)
+                solver_info["preconditioner"] = preconditioner
+                solver_info["iterations"] = len(residual_history)
+            else:
+                raise ValueError(f"Unknown solver '{solver}'. Expected 'lanczos', 'shift-invert' or 'lobpcg'.")
+            stage["num_eigenvalues"] = k
 
-        eigenvalues = cp.sort(eigenvalues)
-        eigenvalues = eigenvalues[eigenvalues > 1e-8]
-        eigenvalues = eigenvalues[:num_eigenvalues]
+            if precision == 'mixed':
+                # Rayleigh-Ritz in float64: orthonormalize the float32 Ritz vectors and solve the projected problem
+                # with the float64 operator rebuilt from the parked values
+                refinement_data = np.memmap(refinement_file, dtype=np.float64, mode='r', shape=solve_matrix.data.shape)
+                L_sparse = backend.sparse.csr_matrix((xp.asarray(refinement_data), solve_matrix.indices,
+                                                      solve_matrix.indptr), shape=solve_matrix.shape)
+                basis, _ = xp.linalg.qr(eigenvectors.astype(xp.float64))
+                projected = basis.T @ (L_sparse @ basis)
+                eigenvalues, ritz_vectors = xp.linalg.eigh((projected + projected.T) / 2)
+                eigenvectors = basis @ ritz_vectors
+                residuals = xp.linalg.norm(L_sparse @ eigenvectors - eigenvectors * eigenvalues[None, :], axis=0)
+                solver_info["max_residual_norm"] = float(residuals.max())
+                del L_sparse, refinement_data
+                refinement_file.close()
 
-        print(f"Eigenvalue computation completed.")
-        return eigenvalues
+        solver_info["wall_time"] = time.time() - start_time
+
+        order = xp.argsort(eigenvalues)
+        eigenvalues = eigenvalues[order]
+        eigenvectors = eigenvectors[:, order]
+        non_zero = eigenvalues > 1e-8
+        eigenvalues = eigenvalues[non_zero][:num_eigenvalues]
+        eigenvectors = eigenvectors[:, non_zero][:, :num_eigenvalues]
+
+        iterations = f"{solver_info['iterations']} iterations, " if solver_info['iterations'] is not None else ""
+        print(f"Eigenvalue computation completed in {solver_info['wall_time']:.2f} seconds "
+              f"({iterations}{solver_info['matvecs']} matvecs).")
+        return eigenvalues, eigenvectors, solver_info
     except Exception as e:
         print(f"Error during eigenvalue computation: {e}")
         traceback.print_exc()
         sys.exit(1)
 
-def main_simulation(N=100000, num_eigenvalues=100, boundary_type='smooth'):
+def operator_cache_key(N, boundary_type, seed, **mesh_options):
+    """
+    Build the cache key for a mesh and its assembled operator from the mesh parameters and code version.
+    """
+    params = dict(mesh_options, N=N, boundary_type=boundary_type, seed=seed, code_version=CODE_VERSION)
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+    return f"{boundary_type}_n{N}_s{seed}_{digest}"
+
+def load_cached_operator(cache_dir, key, backend='auto'):
+    """
+    Load a cached mesh and operator, memory-mapping the arrays from disk.
+    Returns (nodes, elements, L_sparse, reordering), or None on a cache miss.
+    """
+    entry_dir = os.path.join(cache_dir, key)
+    meta_path = os.path.join(entry_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        backend = get_backend(backend)
+        xp = backend.xp
+        with open(meta_path) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode='r')
+                  for name in ('nodes', 'elements', 'data', 'indices', 'indptr')}
+        nodes = xp.asarray(arrays['nodes'])
+        elements = xp.asarray(arrays['elements'])
+        L_sparse = backend.sparse.csr_matrix(
+            (xp.asarray(arrays['data']), xp.asarray(arrays['indices']), xp.asarray(arrays['indptr'])),
+            shape=tuple(meta['shape']))
+        # Touch the entry so eviction treats it as recently used
+        os.utime(meta_path)
+        print(f"Loaded mesh and operator from cache entry {key}.")
+        return nodes, elements, L_sparse, meta.get('reordering')
+    except Exception as e:
+        print(f"Ignoring unreadable cache entry {key}: {e}")
+        return None
+
+def save_cached_operator(cache_dir, key, nodes, elements, L_sparse, backend='auto', max_cache_bytes=None,
+                         reordering=None):
+    """
+    Store a mesh and its assembled CSR operator as .npy files, then evict least recently used entries
+    until the cache fits in max_cache_bytes. The reordering statistics, if any, are kept in the metadata.
+    """
+    try:
+        backend = get_backend(backend)
+        entry_dir = os.path.join(cache_dir, key)
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        arrays = {'nodes': nodes, 'elements': elements,
+                  'data': L_sparse.data, 'indices': L_sparse.indices, 'indptr': L_sparse.indptr}
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), backend.asnumpy(array))
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump({"key": key, "shape": list(L_sparse.shape), "code_version": CODE_VERSION,
+                       "reordering": reordering}, f)
+        if os.path.exists(entry_dir):
+            shutil.rmtree(entry_dir)
+        os.replace(tmp_dir, entry_dir)
+        print(f"Saved mesh and operator to cache entry {key}.")
+        if max_cache_bytes is not None:
+            evict_cache(cache_dir, max_cache_bytes, keep=key)
+    except Exception as e:
+        print(f"Error saving operator cache entry {key}: {e}")
+        traceback.print_exc()
+
+def evict_cache(cache_dir, max_cache_bytes, keep=None):
+    """
+    Remove least recently used cache entries until the total cache size is at most max_cache_bytes.
+    """
+    entries = []
+    for key in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, key)
+        meta_path = os.path.join(entry_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            continue
+        size = sum(os.path.getsize(os.path.join(entry_dir, name)) for name in os.listdir(entry_dir))
+        entries.append((os.path.getmtime(meta_path), size, key))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, key in sorted(entries):
+        if total_size <= max_cache_bytes:
+            break
+        if key == keep:
+            continue
+        shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+        total_size -= size
+        print(f"Evicted cache entry {key} ({size / 1e6:.1f} MB).")
+
+def interpolate_eigenvectors(coarse_nodes, coarse_vectors, fine_nodes, num_neighbors=4):
+    """
+    Interpolate eigenvectors from a coarse mesh onto the nodes of a finer mesh by inverse-distance
+    weighting over the nearest coarse nodes (host arrays).
+    """
+    tree = cKDTree(coarse_nodes)
+    distances, neighbors = tree.query(fine_nodes, k=num_neighbors)
+    weights = 1.0 / np.maximum(distances, 1e-12)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return np.einsum('fk,fkm->fm', weights, coarse_vectors[neighbors])
+
+def main_simulation(N=100000, num_eigenvalues=100, boundary_type='smooth', backend='auto', bc_mode='identity',
+                    boundary_method='topological', boundary_layer=0, solver='lanczos', preconditioner='amg',
+                    seed=None, cache_dir=None, max_cache_bytes=None, mesh_type='random', chunk_size=2**18,
+                    spill_dir=None, profile_path=None, save_outputs=True, warm_start=None,
+                    return_eigenvectors=False, reorder=None, min_quality=0.0, precision='float64',
+                    check_precision=False):
     """
     Run the FEM-based simulation for the Laplacian, including statistical output.
+    Wall time, peak RSS and array sizes are recorded per stage; profile_path also dumps cProfile statistics,
+    to a file named after the boundary type and N (e.g. profile.prof -> profile_smooth_n100000.prof).
+    save_outputs=False skips writing the eigenvalue file and plot (e.g. for benchmarks).
+    warm_start=(coarse_nodes, coarse_eigenvectors) seeds the eigensolver with eigenvectors interpolated from
+    a coarser mesh; return_eigenvectors=True additionally returns (nodes, eigenvectors) on the host, with
+    eigenvectors expanded to all nodes, for warm-starting the next refinement level.
+    reorder='rcm' or 'morton' renumbers the mesh before assembly to improve SpMV locality.
+    min_quality drops random-mesh hull elements whose radius ratio falls below it (see generate_mesh).
+    precision='mixed' solves in float32 with float64 refinement; check_precision=True also runs the pure
+    float64 solve and reports the eigenvalue error and speedup of the mixed-precision path.
+    mesh_type selects random-point Delaunay meshing ('random') or the Kuhn-subdivided grid ('structured').
+    With a cache_dir and a fixed seed (or a structured mesh), the mesh and assembled operator are reused across runs.
     """
     try:
-        print(f"\nStarting simulation for {boundary_type} boundary with N = {N}.")
+        backend = get_backend(backend)
+        print(f"\nStarting simulation for {boundary_type} boundary with N = {N} on the {backend.name} backend.")
         dimension = 3
+        profiler = StageProfiler()
+        cprofile = cProfile.Profile() if profile_path else None
+        if cprofile is not None:
+            profile_root, profile_ext = os.path.splitext(profile_path)
+            profile_path = f"{profile_root}_{boundary_type}_n{N}{profile_ext}"
+            cprofile.enable()
         start_time = time.time()
-        nodes, elements = generate_mesh(N, boundary_type, dimension)
-        L_sparse = assemble_fem_laplacian(nodes, elements)
+        if mesh_type not in ('random', 'structured'):
+            raise ValueError(f"Unknown mesh type '{mesh_type}'. Expected 'random' or 'structured'.")
+        cacheable = cache_dir is not None and (seed is not None or mesh_type == 'structured')
+        cached = None
+        reordering = None
+        if cacheable:
+            cache_key = operator_cache_key(N, boundary_type, seed, dimension=dimension, boundary_layer=boundary_layer,
+                                           mesh_type=mesh_type, reorder=reorder, min_quality=min_quality)
+            with profile_stage(profiler, 'cache_load'):
+                cached = load_cached_operator(cache_dir, cache_key, backend)
+        if cached is not None:
+            nodes, elements, L_sparse, reordering = cached
+            del cached
+        else:
+            if mesh_type == 'structured':
+                with profile_stage(profiler, 'mesh_generation') as stage:
+                    nodes, elements = generate_structured_mesh(N, boundary_type, dimension, backend)
+                    stage["num_points"] = len(nodes)
+                    stage["num_elements"] = len(elements)
+            else:
+                nodes, elements = generate_mesh(N, boundary_type, dimension, backend, boundary_layer, seed,
+                                                profiler, min_quality, chunk_size)
+            if reorder is not None:
+                with profile_stage(profiler, 'reordering') as stage:
+                    nodes, elements, reordering = reorder_mesh(nodes, elements, reorder, backend)
+                    stage.update(reordering)
+            with profile_stage(profiler, 'assembly') as stage:
+                L_sparse = assemble_fem_laplacian(nodes, elements, backend, chunk_size, spill_dir)
+                stage["nnz"] = int(L_sparse.nnz)
+                stage["array_mb"] = array_megabytes(L_sparse)
+            if cacheable:
+                with profile_stage(profiler, 'cache_save'):
+                    save_cached_operator(cache_dir, cache_key, nodes, elements, L_sparse, backend, max_cache_bytes,
+                                         reordering)
+
+        with profile_stage(profiler, 'boundary_conditions') as stage:
+            L_sparse, free_nodes = apply_dirichlet_boundary_conditions(L_sparse, nodes, elements, backend, bc_mode,
+                                                                       boundary_method)
+            stage["num_dofs"] = int(L_sparse.shape[0])
+            stage["array_mb"] = array_megabytes(L_sparse)
 
-        L_sparse = apply_dirichlet_boundary_conditions(L_sparse, nodes)
+        initial_guess = None
+        if warm_start is not None:
+            coarse_nodes, coarse_vectors = warm_start
+            initial_guess = interpolate_eigenvectors(coarse_nodes, coarse_vectors, backend.asnumpy(nodes))
+            # Re-orthonormalize, since interpolation mixes the coarse eigenvectors slightly
+            initial_guess, _ = np.linalg.qr(initial_guess[backend.asnumpy(free_nodes)])
+            initial_guess = backend.xp.asarray(initial_guess)
 
-        eigenvalues = compute_eigenvalues(L_sparse, num_eigenvalues)
+        # Mixed precision holds only the float32 operator during the solve, which needs the solver to own the
+        # only reference to L_sparse; it is kept here only for the float64 reference solve of check_precision
+        operator = [L_sparse]
+        if precision == 'mixed' and not check_precision:
+            del L_sparse
+        eigenvalues, eigenvectors, solver_info = compute_eigenvalues(operator.pop(), num_eigenvalues, backend, solver,
+                                                                     preconditioner, profiler=profiler,
+                                                                     initial_guess=initial_guess, precision=precision)
         if eigenvalues is None or len(eigenvalues) == 0:
             print("Eigenvalue computation failed or returned no valid eigenvalues.")
             sys.exit(1)
 
+        if check_precision and precision == 'mixed':
+            reference, _, reference_info = compute_eigenvalues(L_sparse, num_eigenvalues, backend, solver,
+                                                               preconditioner, initial_guess=initial_guess)
+            reference = backend.asnumpy(reference)
+            mixed = backend.asnumpy(eigenvalues)
+            count = min(len(reference), len(mixed))
+            relative_error = np.abs(mixed[:count] - reference[:count]) / np.abs(reference[:count])
+            solver_info["precision_check"] = {
+                "max_relative_error": float(relative_error.max()),
+                "mean_relative_error": float(relative_error.mean()),
+                "float64_wall_time": reference_info["wall_time"],
+                "speedup": reference_info["wall_time"] / solver_info["wall_time"],
+            }
+            print(f"Mixed precision: max relative eigenvalue error {relative_error.max():.2e}, "
+                  f"speedup {solver_info['precision_check']['speedup']:.2f}x over float64.")
+
         elapsed_time = time.time() - start_time
         print(f"Simulation completed in {elapsed_time:.2f} seconds.")
+        profiler.report()
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(profile_path)
+            print(f"cProfile statistics saved to {profile_path}")
 
         # Compute summary statistics
-        eigenvalues_cpu = eigenvalues.get()
+        eigenvalues_cpu = backend.asnumpy(eigenvalues)
         min_eigenvalue = np.min(eigenvalues_cpu)
         max_eigenvalue = np.max(eigenvalues_cpu)
         mean_eigenvalue = np.mean(eigenvalues_cpu)
@@ -287,28 +1088,40 @@ def main_simulation(N=100000, num_eigenvalues=100, boundary_type='smooth'):
         print(f"First 10 eigenvalues: {first_ten_eigenvalues}")
         print(f"Eigenvalue gaps (first 10): {eigenvalue_gaps}")
 
-        # Save eigenvalues to file
-        filename = f"eigenvalues_{boundary_type}_n{N}_d{dimension}.npy"
-        np.save(filename, eigenvalues_cpu)
-        print(f"Eigenvalues saved to {filename}")
-
-        # Optional: Plot eigenvalue distribution
-        plt.figure(figsize=(10, 6))
-        plt.plot(eigenvalues_cpu, np.arange(1, len(eigenvalues_cpu)+1), drawstyle='steps-post')
-        plt.xlabel('Eigenvalue λ')
-        plt.ylabel('Eigenvalue Count N(λ)')
-        plt.title(f'Eigenvalue Distribution for {boundary_type.capitalize()} Boundary (N={N}, Dimension={dimension})')
-        plt.grid(True)
-        plot_filename = f'eigenvalues_distribution_{boundary_type}.png'
-        plt.savefig(plot_filename)
-        print(f"Eigenvalue distribution plot saved as {plot_filename}")
+        if save_outputs:
+            # Save eigenvalues to file
+            filename = f"eigenvalues_{boundary_type}_n{N}_d{dimension}.npy"
+            np.save(filename, eigenvalues_cpu)
+            print(f"Eigenvalues saved to {filename}")
+
+            # Optional: Plot eigenvalue distribution
+            plt.figure(figsize=(10, 6))
+            plt.plot(eigenvalues_cpu, np.arange(1, len(eigenvalues_cpu)+1), drawstyle='steps-post')
+            plt.xlabel('Eigenvalue λ')
+            plt.ylabel('Eigenvalue Count N(λ)')
+            plt.title(f'Eigenvalue Distribution for {boundary_type.capitalize()} Boundary (N={N}, Dimension={dimension})')
+            plt.grid(True)
+            plot_filename = f'eigenvalues_distribution_{boundary_type}_n{N}.png'
+            plt.savefig(plot_filename)
+            plt.close()
+            print(f"Eigenvalue distribution plot saved as {plot_filename}")
 
         result = {
             "boundary_type": boundary_type,
             "dimension": dimension,
+            "backend": backend.name,
+            "bc_mode": bc_mode,
+            "boundary_method": boundary_method,
+            "boundary_layer": boundary_layer,
             "mesh_size": N,
+            "mesh_type": mesh_type,
+            "reordering": reordering,
+            "min_quality": min_quality,
+            "seed": seed,
             "num_eigenvalues": num_eigenvalues,
             "elapsed_time": elapsed_time,
+            "solver": solver_info,
+            "stage_timings": profiler.stages,
             "summary_statistics": {
                 "min_eigenvalue": min_eigenvalue,
                 "max_eigenvalue": max_eigenvalue,
@@ -319,15 +1132,21 @@ def main_simulation(N=100000, num_eigenvalues=100, boundary_type='smooth'):
                 "eigenvalue_gaps": eigenvalue_gaps.tolist()
             }
         }
+        if return_eigenvectors:
+            nodes_cpu = backend.asnumpy(nodes)
+            full_eigenvectors = np.zeros((len(nodes_cpu), eigenvectors.shape[1]))
+            full_eigenvectors[backend.asnumpy(free_nodes)] = backend.asnumpy(eigenvectors)
+            return result, (nodes_cpu, full_eigenvectors)
         return result
     except Exception as e:
         print(f"Error during main simulation: {e}")
         traceback.print_exc()
         sys.exit(1)
 
-def run_simulations():
+def run_simulations(**simulation_options):
     """
     Run simulations for multiple boundary types and mesh sizes.
+    Keyword arguments are passed through to main_simulation.
     """
     try:
         boundary_types = ['smooth', 'edge', 'cusp', 'conical']
@@ -336,7 +1155,8 @@ def run_simulations():
         results = []
 
         for boundary in boundary_types:
-            result = main_simulation(N=N, num_eigenvalues=num_eigenvalues, boundary_type=boundary)
+            result = main_simulation(N=N, num_eigenvalues=num_eigenvalues, boundary_type=boundary,
+                                     **simulation_options)
             results.append(result)
             print(f"\nSimulation completed for {boundary} boundary. Results:")
             print(json.dumps(result["summary_statistics"], indent=4))
@@ -350,5 +1170,179 @@ def run_simulations():
         traceback.print_exc()
         sys.exit(1)
 
+def run_refinement_study(boundary_type='smooth', mesh_sizes=(10000, 30000, 100000), num_eigenvalues=100,
+                         warm_start=True, results_path=None, **simulation_options):
+    """
+    Solve the same boundary type on increasingly fine meshes to study eigenvalue convergence.
+    With warm_start, each level's eigensolve is seeded with the previous level's eigenvectors
+    interpolated onto the finer mesh.
+    """
+    try:
+        results = []
+        previous_level = None
+        for N in sorted(mesh_sizes):
+            result, level = main_simulation(N=N, num_eigenvalues=num_eigenvalues, boundary_type=boundary_type,
+                                            warm_start=previous_level if warm_start else None,
+                                            return_eigenvectors=True, **simulation_options)
+            results.append(result)
+            previous_level = level
+
+        print(f"\nRefinement study for {boundary_type} boundary ({'warm' if warm_start else 'cold'} start):")
+        print(f"{'N':>10}{'Iterations':>12}{'Matvecs':>10}{'Solve (s)':>12}{'Lowest eigenvalue':>20}")
+        for result in results:
+            solver_info = result["solver"]
+            iterations = solver_info['iterations'] if solver_info['iterations'] is not None else "n/a"
+            print(f"{result['mesh_size']:>10}{iterations:>12}{solver_info['matvecs']:>10}"
+                  f"{solver_info['wall_time']:>12.2f}{result['summary_statistics']['min_eigenvalue']:>20.6g}")
+
+        results_path = results_path or f"refinement_study_{boundary_type}.json"
+        with open(results_path, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"Refinement study results saved to '{results_path}'.")
+        return results
+    except Exception as e:
+        print(f"Error during refinement study: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+def _limit_worker_threads(threads_per_worker):
+    """
+    Process-pool initializer that caps the BLAS/OpenMP thread pools of a worker.
+    """
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(threads_per_worker)
+    except ImportError:
+        pass
+
+def _run_simulation_job(job, simulation_options):
+    """
+    Run a single (boundary_type, N) job inside a worker process.
+    """
+    boundary_type, N, num_eigenvalues = job
+    return main_simulation(N=N, num_eigenvalues=num_eigenvalues, boundary_type=boundary_type, **simulation_options)
+
+def run_simulations_parallel(boundary_types=('smooth', 'edge', 'cusp', 'conical'), mesh_sizes=(100000,),
+                             num_eigenvalues=100, max_workers=None, threads_per_worker=1,
+                             results_path='simulation_results.jsonl', **simulation_options):
+    """
+    Run simulations for all (boundary_type, N) combinations on a process pool.
+
+    Each result is appended to a JSON-lines file as soon as it completes, and jobs already present
+    in that file are skipped, so an interrupted sweep can be restarted where it left off.
+    """
+    try:
+        finished = set()
+        if os.path.exists(results_path):
+            with open(results_path) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        finished.add((record["boundary_type"], record["mesh_size"]))
+
+        jobs = [(boundary, N, num_eigenvalues) for N in mesh_sizes for boundary in boundary_types
+                if (boundary, N) not in finished]
+        print(f"{len(finished)} jobs already finished, {len(jobs)} jobs to run.")
+        if not jobs:
+            return
+
+        max_workers = max_workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+        # Workers are spawned fresh, so these limits are in place before they import NumPy
+        thread_env = {var: str(threads_per_worker) for var in
+                      ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'NUMEXPR_NUM_THREADS')}
+        saved_env = {var: os.environ.get(var) for var in thread_env}
+        os.environ.update(thread_env)
+        try:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                     initializer=_limit_worker_threads, initargs=(threads_per_worker,)) as executor:
+                futures = {executor.submit(_run_simulation_job, job, simulation_options): job for job in jobs}
+                for future in as_completed(futures):
+                    boundary, N, _ = futures[future]
+                    try:
+                        result = future.result()
+                    except BaseException as e:
+                        print(f"Simulation failed for {boundary} boundary with N = {N}: {e!r}")
+                        continue
+                    with open(results_path, 'a') as f:
+                        f.write(json.dumps(result) + "\n")
+                    print(f"Simulation completed for {boundary} boundary with N = {N}; appended to '{results_path}'.")
+        finally:
+            for var, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(var, None)
+                else:
+                    os.environ[var] = value
+    except Exception as e:
+        print(f"Error during parallel simulations: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
 if __name__ == "__main__":
-    run_simulations()
+    parser = argparse.ArgumentParser(description="FEM Laplacian spectral simulations on the unit cube.")
+    parser.add_argument("--backend", choices=['auto', 'numpy', 'cupy'], default='auto',
+                        help="Array backend: NumPy/SciPy, CuPy, or CuPy when available (default).")
+    parser.add_argument("--bc-mode", choices=['identity', 'reduced'], default='identity',
+                        help="Dirichlet treatment: identity rows on the full system, or elimination of boundary DOFs.")
+    parser.add_argument("--boundary-method", choices=['topological', 'box'], default='topological',
+                        help="Boundary detection: single-owner hull faces, or nodes on the unit-cube faces.")
+    parser.add_argument("--boundary-layer", type=int, default=0,
+                        help="Points per edge of a structured boundary layer added on the cube faces (0 disables).")
+    parser.add_argument("--solver", choices=['lanczos', 'shift-invert', 'lobpcg'], default='lanczos',
+                        help="Eigensolver strategy for the smallest eigenvalues.")
+    parser.add_argument("--preconditioner", choices=['amg', 'ilu', 'jacobi', 'none'], default='amg',
+                        help="Preconditioner for the lobpcg solver.")
+    parser.add_argument("--mesh-type", choices=['random', 'structured'], default='random',
+                        help="Random-point Delaunay mesh, or a structured Kuhn-subdivided grid.")
+    parser.add_argument("--reorder", choices=['rcm', 'morton'], default=None,
+                        help="Renumber nodes before assembly (reverse Cuthill-McKee or Morton order).")
+    parser.add_argument("--min-quality", type=float, default=0.0,
+                        help="Drop random-mesh hull elements whose radius ratio (0-1) is below this threshold.")
+    parser.add_argument("--precision", choices=['float64', 'mixed'], default='float64',
+                        help="Operator precision for the eigensolve: float64, or float32 with float64 refinement.")
+    parser.add_argument("--check-precision", action='store_true',
+                        help="With --precision mixed, also solve in float64 and report the eigenvalue error.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for the random mesh points; required for operator caching.")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory for the on-disk mesh and operator cache (disabled if omitted).")
+    parser.add_argument("--cache-max-gb", type=float, default=None,
+                        help="Evict least recently used cache entries beyond this total size.")
+    parser.add_argument("--chunk-size", type=int, default=2**18,
+                        help="Elements per assembly chunk; bounds peak memory during assembly.")
+    parser.add_argument("--spill-dir", default=None,
+                        help="Spill partial assembly matrices to this directory and keep the merged operator memory-mapped there.")
+    parser.add_argument("--profile-path", default=None,
+                        help="Dump cProfile statistics of each simulation to this path, suffixed with its boundary type and N.")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Run (boundary type, N) jobs on this many worker processes (0 runs serially).")
+    parser.add_argument("--threads-per-worker", type=int, default=1,
+                        help="BLAS/OpenMP threads per worker process.")
+    parser.add_argument("--mesh-sizes", type=int, nargs='+', default=[100000],
+                        help="Mesh sizes N for the parallel sweep.")
+    parser.add_argument("--num-eigenvalues", type=int, default=100,
+                        help="Number of eigenvalues per job in the parallel sweep.")
+    parser.add_argument("--results", default='simulation_results.jsonl',
+                        help="JSON-lines file that parallel results are appended to.")
+    parser.add_argument("--refinement-study", metavar='BOUNDARY_TYPE', default=None,
+                        help="Run a mesh-refinement study for this boundary type over --mesh-sizes.")
+    parser.add_argument("--cold-start", action='store_true',
+                        help="Do not warm-start refinement levels from the coarser eigenvectors.")
+    args = vars(parser.parse_args())
+    cache_max_gb = args.pop('cache_max_gb')
+    args['max_cache_bytes'] = None if cache_max_gb is None else int(cache_max_gb * 1e9)
+    workers = args.pop('workers')
+    threads_per_worker = args.pop('threads_per_worker')
+    mesh_sizes = args.pop('mesh_sizes')
+    num_eigenvalues = args.pop('num_eigenvalues')
+    results_path = args.pop('results')
+    refinement_study = args.pop('refinement_study')
+    cold_start = args.pop('cold_start')
+    if refinement_study is not None:
+        run_refinement_study(refinement_study, mesh_sizes=mesh_sizes, num_eigenvalues=num_eigenvalues,
+                             warm_start=not cold_start, **args)
+    elif workers > 0:
+        run_simulations_parallel(mesh_sizes=mesh_sizes, num_eigenvalues=num_eigenvalues, max_workers=workers,
+                                 threads_per_worker=threads_per_worker, results_path=results_path, **args)
+    else:
+        run_simulations(**args)
@@ -0,0 +1,167 @@
+import numpy as np
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import Laplacian
+
+DEFAULT_SIZES = [1000, 3000, 10000, 30000, 100000, 300000, 1000000]
+
+def _run_benchmark_case(case, simulation_options):
+    """
+    Run one benchmark case; executed in a fresh process so peak RSS is not inherited from earlier cases.
+    """
+    boundary_type, N, backend = case
+    result = Laplacian.main_simulation(N=N, boundary_type=boundary_type, backend=backend, save_outputs=False,
+                                       **simulation_options)
+    return {
+        "boundary_type": boundary_type,
+        "backend": result["backend"],
+        "mesh_size": N,
+        "elapsed_time": result["elapsed_time"],
+        "solver": result["solver"],
+        "stages": result["stage_timings"],
+    }
+
+def run_benchmarks(sizes, boundary_types, backends, **simulation_options):
+    """
+    Sweep mesh sizes, boundary types and backends, recording per-stage time and memory for each case.
+    """
+    runs = []
+    context = multiprocessing.get_context('spawn')
+    for backend in backends:
+        for boundary_type in boundary_types:
+            for N in sizes:
+                case = (boundary_type, N, backend)
+                print(f"\nBenchmarking {boundary_type} boundary, N = {N}, backend = {backend}.")
+                try:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                        runs.append(executor.submit(_run_benchmark_case, case, simulation_options).result())
+                except (Exception, BrokenProcessPool, SystemExit) as e:
+                    # main_simulation exits on errors and a crashed worker breaks the pool; Ctrl-C still stops the sweep
+                    print(f"Benchmark case {case} failed: {e!r}")
+    return runs
+
+def fit_scaling_exponents(runs):
+    """
+    Fit time ~ C * N^alpha per (backend, boundary type, stage) by least squares in log-log space.
+    """
+    series = {}
+    for run in runs:
+        stages = [(stage["stage"], stage["wall_time"]) for stage in run["stages"]]
+        stages.append(("total", run["elapsed_time"]))
+        for stage_name, wall_time in stages:
+            key = (run["backend"], run["boundary_type"], stage_name)
+            series.setdefault(key, []).append((run["mesh_size"], wall_time))
+
+    exponents = []
+    for (backend, boundary_type, stage_name), points in sorted(series.items()):
+        points = [(N, t) for N, t in points if t > 0]
+        if len({N for N, _ in points}) < 2:
+            continue
+        log_n, log_t = np.log([N for N, _ in points]), np.log([t for _, t in points])
+        alpha, log_c = np.polyfit(log_n, log_t, 1)
+        exponents.append({"backend": backend, "boundary_type": boundary_type, "stage": stage_name,
+                          "exponent": float(alpha), "coefficient": float(np.exp(log_c))})
+    return exponents
+
+def print_exponents(exponents):
+    print(f"\n{'Backend':<8}{'Boundary':<10}{'Stage':<22}{'Exponent':>10}")
+    for fit in exponents:
+        print(f"{fit['backend']:<8}{fit['boundary_type']:<10}{fit['stage']:<22}{fit['exponent']:>10.2f}")
+
+def compare_to_baseline(report, baseline, tolerance=1.25, min_time=0.05):
+    """
+    Compare stage times and scaling exponents with a saved baseline report.
+    Returns the list of regressions (time ratio above tolerance, or exponent growth above 0.1).
+    Stages faster than min_time seconds are too noisy to be flagged.
+    """
+    def stage_times(runs):
+        times = {}
+        for run in runs:
+            for stage in run["stages"]:
+                times[(run["backend"], run["boundary_type"], run["mesh_size"], stage["stage"])] = stage["wall_time"]
+        return times
+
+    current, previous = stage_times(report["runs"]), stage_times(baseline["runs"])
+    regressions = []
+    print(f"\n{'Backend':<8}{'Boundary':<10}{'N':>9}  {'Stage':<22}{'Baseline (s)':>14}{'Current (s)':>13}{'Ratio':>8}")
+    for key in sorted(current.keys() & previous.keys()):
+        backend, boundary_type, N, stage_name = key
+        ratio = current[key] / previous[key] if previous[key] > 0 else float('inf')
+        flag = ""
+        if ratio > tolerance and current[key] >= min_time:
+            flag = "  REGRESSION"
+            regressions.append({"case": list(key), "baseline": previous[key], "current": current[key],
+                                "ratio": ratio})
+        print(f"{backend:<8}{boundary_type:<10}{N:>9}  {stage_name:<22}{previous[key]:>14.3f}"
+              f"{current[key]:>13.3f}{ratio:>8.2f}{flag}")
+
+    baseline_exponents = {(fit["backend"], fit["boundary_type"], fit["stage"]): fit["exponent"]
+                          for fit in baseline.get("exponents", [])}
+    for fit in report["exponents"]:
+        key = (fit["backend"], fit["boundary_type"], fit["stage"])
+        if key in baseline_exponents and fit["exponent"] - baseline_exponents[key] > 0.1:
+            regressions.append({"case": list(key), "baseline_exponent": baseline_exponents[key],
+                                "current_exponent": fit["exponent"]})
+            print(f"Scaling regression for {key}: exponent {baseline_exponents[key]:.2f} -> {fit['exponent']:.2f}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark for the FEM Laplacian pipeline.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES, help="Mesh sizes N to sweep.")
+    parser.add_argument("--boundary-types", nargs='+', default=['smooth', 'edge', 'cusp', 'conical'],
+                        help="Boundary types to sweep.")
+    parser.add_argument("--backends", nargs='+', choices=['numpy', 'cupy'], default=['numpy'],
+                        help="Array backends to sweep.")
+    parser.add_argument("--num-eigenvalues", type=int, default=20, help="Eigenvalues computed per case.")
+    parser.add_argument("--solver", choices=['lanczos', 'shift-invert', 'lobpcg'], default='lobpcg',
+                        help="Eigensolver strategy. The default preconditioned LOBPCG keeps memory linear in N up to "
+                             "1e6 nodes (install pyamg for the AMG preconditioner); shift-invert's sparse LU does not.")
+    parser.add_argument("--mesh-type", choices=['random', 'structured'], default='random', help="Mesh generator.")
+    parser.add_argument("--bc-mode", choices=['identity', 'reduced'], default='reduced', help="Dirichlet treatment.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random meshes.")
+    parser.add_argument("--output", default='benchmark_results.json', help="File the benchmark report is written to.")
+    parser.add_argument("--baseline", default=None, help="Baseline report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="Time ratio above which a stage counts as a regression.")
+    args = parser.parse_args()
+
+    try:
+        runs = run_benchmarks(args.sizes, args.boundary_types, args.backends, num_eigenvalues=args.num_eigenvalues,
+                              solver=args.solver, mesh_type=args.mesh_type, bc_mode=args.bc_mode, seed=args.seed)
+        exponents = fit_scaling_exponents(runs)
+        print_exponents(exponents)
+
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "settings": vars(args),
+            "runs": runs,
+            "exponents": exponents,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"\nBenchmark report saved to '{args.output}'.")
+
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            regressions = compare_to_baseline(report, baseline, args.tolerance)
+            print(f"\n{len(regressions)} regression(s) against '{args.baseline}'.")
+            if regressions:
+                sys.exit(1)
+    except Exception as e:
+        print(f"Error during benchmark: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()